@@ -0,0 +1,274 @@
+"""🔊 TTS 音频磁盘缓存
+
+按 (text, lang, slow) 内容寻址存成 mp3 (gTTS) 或 wav (本地引擎，见 tts.py) 文件，
+超过容量上限时按最近使用时间 (LRU) 淘汰。
+复习模式可以把接下来的几张卡片丢给后台线程预渲染，翻卡时不再等网络；
+ensure_many 一次把整副牌缺的音频在一个线程池里渲染完。
+断网时本地引擎顶上的文件，renderer.stale(path) 说主后端恢复了就在后台重新渲染替换掉。
+缓存目录放在 Streamlit 的 static/ 下时，页面可以直接用哈希 URL 引用音频，不必内嵌 base64。
+"""
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import profiler
+from lazy import lazy
+
+gtts = lazy("gtts")  # 第一次真正合成时才 import
+
+AUDIO_EXTS = (".mp3", ".wav")
+
+
+def audio_key(text, lang='fr', slow=False):
+    raw = f"{lang}|{int(bool(slow))}|{text}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def audio_format(data):
+    """本地引擎出 wav，gTTS 出 mp3"""
+    return "wav" if data[:4] == b"RIFF" else "mp3"
+
+
+def render_gtts(text, lang='fr', slow=False):
+    fp = io.BytesIO()
+    gtts.gTTS(text=text, lang=lang, slow=slow).write_to_fp(fp)
+    return fp.getvalue()
+
+
+class AudioCache:
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024, renderer=None, workers=2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.renderer = renderer or render_gtts
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-prefetch")
+        self._bytes = sum(size for _, size, _ in self._scan())
+
+        # 统计：命中/未命中次数，以及未命中时真正花在 TTS 上的时间
+        # waits: 要用的时候预渲染还没跑完、只好等它的次数 (那次渲染已经记成 miss，不算命中)
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.miss_seconds = 0.0
+
+    def path(self, key, ext=".mp3"):
+        return os.path.join(self.cache_dir, key + ext)
+
+    def existing(self, key):
+        """磁盘上已有的文件 (mp3 或 wav)，没有就返回 None"""
+        for ext in AUDIO_EXTS:
+            path = self.path(key, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def ensure(self, text, lang='fr', slow=False):
+        """保证音频已经在磁盘上，返回文件路径；缓存里没有就同步渲染"""
+        key = audio_key(text, lang, slow)
+        with self._lock:
+            pending = self._inflight.get(key)
+        if pending is not None:
+            # 预渲染已经在跑了，等它就好，不重复请求
+            try:
+                path = pending.result()
+            except Exception:
+                pass
+            else:
+                profiler.count("audio.wait")
+                with self._lock:
+                    self.waits += 1
+                return path
+
+        path = self.existing(key)
+        if path is not None:
+            os.utime(path, None)  # 刷新 mtime，作为 LRU 的使用时间
+            self._count_hit()
+            if self._stale(path):
+                self._submit(key, text, lang, slow)  # 这次先播旧的，后台换成主后端的版本
+        else:
+            path = self._render_to_disk(key, text, lang, slow)
+        return path
+
+    def get(self, text, lang='fr', slow=False):
+        """返回 mp3 字节"""
+        with open(self.ensure(text, lang, slow), 'rb') as f:
+            return f.read()
+
+    def prefetch(self, texts, lang='fr', slow=False):
+        """把还没缓存的文本丢给后台线程渲染"""
+        for text in texts:
+            if not text:
+                continue
+            key = audio_key(text, lang, slow)
+            path = self.existing(key)
+            if path is None or self._stale(path):
+                self._submit(key, text, lang, slow)
+
+    def ensure_many(self, texts, lang='fr', slow=False, workers=4, progress=None):
+        """整轮复习 / 整副牌一次渲染：只渲染缺的 (和该换掉的)，在一个线程池里并发跑完
+
+        返回 (新渲染了多少, 失败的文本列表)；progress(完成数, 总数) 在调用线程里回调
+        """
+        todo = {}
+        for text in dict.fromkeys(filter(None, texts)):
+            key = audio_key(text, lang, slow)
+            path = self.existing(key)
+            if path is None or self._stale(path):
+                todo[key] = text
+        if not todo:
+            return 0, []
+
+        futures = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-batch") as pool:
+            for key, text in todo.items():
+                with self._lock:
+                    future = self._inflight.get(key)  # 后台预渲染已经在跑的就等它
+                    fresh = future is None
+                    if fresh:
+                        future = pool.submit(self._render_to_disk, key, text, lang, slow)
+                        self._inflight[key] = future
+                if fresh:
+                    future.add_done_callback(lambda _f, k=key: self._finish(k))
+                futures[future] = text
+
+            rendered, failed = 0, []
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    future.result()
+                    rendered += 1
+                except Exception:
+                    failed.append(futures[future])
+                if progress:
+                    progress(done, len(futures))
+        return rendered, failed
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_miss = self.miss_seconds / self.misses if self.misses else 0.0
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'avg_miss_seconds': avg_miss,
+                'saved_seconds': self.hits * avg_miss,
+                'bytes': self._bytes,
+            }
+
+    # --- 内部 ---
+    def _stale(self, path):
+        stale = getattr(self.renderer, 'stale', None)
+        return stale is not None and stale(path)
+
+    def _submit(self, key, text, lang, slow):
+        """丢给后台线程渲染；同一个 key 已经在跑就不重复提交"""
+        with self._lock:
+            if key in self._inflight:
+                return
+            future = self._pool.submit(self._render_to_disk, key, text, lang, slow)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f, k=key: self._finish(k))
+
+    def _count_hit(self):
+        profiler.count("audio.hit")
+        with self._lock:
+            self.hits += 1
+
+    def _finish(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _render_to_disk(self, key, text, lang, slow):
+        start = time.perf_counter()
+        data = self.renderer(text, lang, slow)
+        elapsed = time.perf_counter() - start
+        profiler.count("audio.miss")
+        profiler.record("tts.render", elapsed)  # 后台预渲染不属于任何 rerun，只进全局汇总
+
+        path = self.path(key, "." + audio_format(data))
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        replaced = self._size(path)
+        os.replace(tmp, path)  # 原子替换，读者永远看不到写了一半的文件
+        for ext in AUDIO_EXTS:
+            old = self.path(key, ext)
+            if old != path:
+                # 换了格式 (比如 wav 换成 mp3)：旧文件删掉
+                replaced += self._size(old)
+                try:
+                    os.remove(old)
+                except FileNotFoundError:
+                    pass
+
+        with self._lock:
+            self.misses += 1
+            self.miss_seconds += elapsed
+            self._bytes += len(data) - replaced
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict()
+        return path
+
+    @staticmethod
+    def _size(path):
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _scan(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(AUDIO_EXTS):
+                st = entry.stat()
+                entries.append((entry.path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._bytes = total
+
+
+# --- 页面里的 <audio> 标签 ---
+def inline_src(data):
+    return f"data:audio/{audio_format(data)};base64," + base64.b64encode(data).decode()
+
+
+def static_src(path, url_prefix):
+    # 文件名就是内容哈希，URL 稳定，浏览器可以放心缓存
+    return f"{url_prefix}/{os.path.basename(path)}"
+
+
+def audio_src(cache, text, lang='fr', slow=False, mode="url", url_prefix="app/static/audio"):
+    if mode == "url":
+        return static_src(cache.ensure(text, lang, slow), url_prefix)
+    return inline_src(cache.get(text, lang, slow))
+
+
+def audio_tag(src, uid):
+    # 每次用新的 id，保证同一个词重复播放时浏览器也会重新触发 autoplay
+    return f"""
+            <audio autoplay style="display:none;" id="audio_{uid}">
+            <source src="{src}" type="audio/{'wav' if src.endswith('.wav') or src.startswith('data:audio/wav') else 'mp3'}">
+            </audio>
+            <div style="display:none;">{uid}</div>
+            """
@@ -0,0 +1,222 @@
+"""🧪 整个应用的无头基准：AppTest + 本地替身服务，两种模式都跑
+
+    python bench/bench_app.py [--decks 1000,10000,100000] [--lookups 10] [--adds 5] [--cards 50]
+                              [--failure-rate 0.05] [--latency translation=0.15,tts=0.1]
+
+每个词表大小起一个新进程 (缓存、内存都从零开始)，在临时目录里放一份合成的 vocab.csv
+和配了 GitHub 的 secrets.toml，然后：
+
+- cold:    第一次打开页面 (含 CSV 导入 SQLite、建索引)
+- lookup:  查不在词表里的词 (走翻译 + Wiktionary 替身)
+- known:   查词表里已有的词
+- add:     查一个新词再点 Ajouter
+- review:  一轮完整复习，每张卡 Voir + 打分
+
+报告每一步 rerun 的 p50/p95、进程内存 (RSS / 峰值)、页面元素序列化后的大小。
+结果追加到 bench/results/app.jsonl (带 git 提交号)，并和上一个不同提交的同配置结果对比。
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH, "..")
+RESULTS = os.path.join(BENCH, "results", "app.jsonl")
+SECRETS = '[github]\ntoken = "bench"\nrepo_name = "bench/vocab"\n'
+
+
+def memory_mb():
+    """(当前 RSS, 峰值 RSS)，单位 MB"""
+    out = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    out[line[:5]] = int(line.split()[1]) / 1024
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+    return out.get("VmRSS", 0.0), out.get("VmHWM", 0.0)
+
+
+def payload_bytes(node):
+    """页面上所有元素 proto 序列化后的总字节数 (近似发给浏览器的量)"""
+    total = 0
+    for child in getattr(node, 'children', {}).values():
+        proto = getattr(child, 'proto', None)
+        if proto is not None and not hasattr(child, 'children'):
+            total += len(proto.SerializeToString())
+        total += payload_bytes(child)
+    return total
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+# --- 子进程：真正跑 AppTest ---
+def child(args):
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCH)
+    from stubs import Stubs
+    stubs = Stubs(latency=parse_latency(args.latency), failure_rate=args.failure_rate).install()
+    from streamlit.testing.v1 import AppTest
+
+    scenarios = {}
+
+    def measure(name, at, action):
+        start = time.perf_counter()
+        action()
+        elapsed = (time.perf_counter() - start) * 1000
+        entry = scenarios.setdefault(name, {'ms': [], 'payload': [], 'errors': 0})
+        entry['ms'].append(elapsed)
+        entry['payload'].append(payload_bytes(at._tree))
+        entry['errors'] += len(at.exception)
+
+    at = AppTest.from_file(os.path.join(ROOT, "words_app.py"), default_timeout=300)
+    measure('cold', at, at.run)
+
+    for i in range(args.lookups):
+        measure('lookup', at, lambda: at.text_input[0].set_value(f"inconnu{i}").run())
+    for i in range(args.lookups):
+        measure('known', at, lambda: at.text_input[0].set_value(f"mot{i * 7}").run())
+    for i in range(args.adds):
+        at.text_input[0].set_value(f"nouveau{i}").run()
+        if at.form_submit_button:
+            measure('add', at, lambda: at.form_submit_button[0].click().run())
+
+    at.sidebar.radio[0].set_value("📖 Review").run()
+    graded = 0
+    while graded < args.cards:
+        buttons = {b.label: b for b in at.button}
+        if "🔍 Voir" not in buttons:
+            break
+        measure('review', at, lambda: buttons["🔍 Voir"].click().run())
+        buttons = {b.label: b for b in at.button}
+        grade = "🍷 Délicieux" if graded % 3 else "🧂 Trop Salé"
+        measure('review', at, lambda: buttons[grade].click().run())
+        graded += 1
+
+    if not any(b.label == "🔍 Voir" for b in at.button):
+        # 一轮结束时应用会立刻在后台推一次 GitHub，等它推完再统计
+        deadline = time.time() + 10
+        while stubs.repo.commits == 0 and time.time() < deadline:
+            time.sleep(0.05)
+
+    rss, peak = memory_mb()
+    print(json.dumps({
+        'scenarios': {name: {
+            'n': len(entry['ms']),
+            'p50_ms': percentile(entry['ms'], 0.5),
+            'p95_ms': percentile(entry['ms'], 0.95),
+            'payload_kb': sum(entry['payload']) / len(entry['payload']) / 1024,
+            'errors': entry['errors'],
+        } for name, entry in scenarios.items()},
+        'graded': graded,
+        'github_commits': stubs.repo.commits,
+        'rss_mb': rss,
+        'peak_mb': peak,
+        'calls': stubs.calls,
+        'failures': stubs.failures,
+    }))
+
+
+def parse_latency(text):
+    out = {}
+    for item in filter(None, (text or "").split(",")):
+        name, value = item.split("=")
+        out[name.strip()] = float(value)
+    return out
+
+
+# --- 父进程：准备目录、收集、存档、对比 ---
+def run_deck(size, args):
+    sys.path.insert(0, BENCH)
+    from bench_storage import synthetic_csv
+
+    tmp = tempfile.mkdtemp()
+    try:
+        synthetic_csv(os.path.join(tmp, "vocab.csv"), size)
+        os.makedirs(os.path.join(tmp, ".streamlit"))
+        with open(os.path.join(tmp, ".streamlit", "secrets.toml"), "w") as f:
+            f.write(SECRETS)
+        cmd = [sys.executable, os.path.abspath(__file__), "--child",
+               "--lookups", str(args.lookups), "--adds", str(args.adds), "--cards", str(args.cards),
+               "--failure-rate", str(args.failure_rate), "--latency", args.latency or ""]
+        proc = subprocess.run(cmd, cwd=tmp, capture_output=True, text=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        sys.exit(f"deck {size}: child failed\n{proc.stderr[-3000:]}")
+    return json.loads(lines[-1])
+
+
+def git_commit():
+    def git(*cmd):
+        return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return commit + ("-dirty" if git("status", "--porcelain", "--untracked-files=no") else "")
+
+
+def previous_result(config, commit):
+    if not os.path.exists(RESULTS):
+        return None
+    last = None
+    with open(RESULTS, encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry['config'] == config and entry['commit'] != commit:
+                last = entry
+    return last
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--decks", default="1000,10000,100000")
+    parser.add_argument("--lookups", type=int, default=10)
+    parser.add_argument("--adds", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--latency", default="", help="per-service latency in seconds, e.g. translation=0.2,tts=0.05")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    commit = git_commit()
+    os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+    for size in [int(s) for s in args.decks.split(",")]:
+        config = {'deck': size, 'lookups': args.lookups, 'adds': args.adds, 'cards': args.cards,
+                  'failure_rate': args.failure_rate, 'latency': args.latency}
+        start = time.perf_counter()
+        result = run_deck(size, args)
+        before = previous_result(config, commit)
+
+        print(f"\n== deck {size} cards · {result['graded']} graded · {result['github_commits']} GitHub commits · RSS {result['rss_mb']:.0f} MB "
+              f"(peak {result['peak_mb']:.0f} MB) · {time.perf_counter() - start:.0f} s"
+              + (f" · vs {before['commit']}" if before else ""))
+        print(f"{'':<8}{'n':>4}{'p50 ms':>9}{'p95 ms':>9}{'page KB':>9}{'errors':>8}")
+        for name, s in result['scenarios'].items():
+            line = f"{name:<8}{s['n']:>4}{s['p50_ms']:>9.0f}{s['p95_ms']:>9.0f}{s['payload_kb']:>9.1f}{s['errors']:>8}"
+            old = before and before['result']['scenarios'].get(name)
+            if old:
+                line += f"   p95 {(s['p95_ms'] - old['p95_ms']) / max(old['p95_ms'], 1e-9):+.0%}"
+            print(line)
+        print("stub calls: " + ", ".join(f"{name} {n} ({result['failures'][name]} failed)" for name, n in result['calls'].items()))
+
+        if not args.no_save:
+            with open(RESULTS, "a", encoding='utf-8') as f:
+                f.write(json.dumps({'commit': commit, 'ts': time.time(), 'config': config, 'result': result}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""🔊 内嵌 base64 vs 静态 URL：每张卡片发往浏览器的字节数和渲染耗时
+
+    python bench/bench_audio_payload.py [--cards 50] [--plays 3]
+
+TTS 用本地假渲染器代替 (按词长生成接近 gTTS 大小的字节)，只比较页面负载本身。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_cache import AudioCache, audio_src, audio_tag  # noqa: E402
+
+
+def fake_renderer(text, lang='fr', slow=False):
+    # gTTS 一个单词大约 5~10 KB 的 mp3
+    return os.urandom(4000 + 600 * len(text))
+
+
+def run(mode, words, plays):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AudioCache(cache_dir, renderer=fake_renderer)
+        first_bytes, repeat_bytes, timings = 0, 0, []
+        for play in range(plays):
+            for i, word in enumerate(words):
+                start = time.perf_counter()
+                tag = audio_tag(audio_src(cache, word, mode=mode), f"{play}_{i}")
+                timings.append(time.perf_counter() - start)
+                if play == 0:
+                    first_bytes += len(tag.encode('utf-8'))
+                else:
+                    repeat_bytes += len(tag.encode('utf-8'))
+        timings.sort()
+        return {
+            'first_play_bytes_per_card': first_bytes / len(words),
+            'repeat_play_bytes_per_card': repeat_bytes / (len(words) * max(plays - 1, 1)),
+            'p50_ms': timings[len(timings) // 2] * 1000,
+            'p95_ms': timings[int(len(timings) * 0.95)] * 1000,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--plays", type=int, default=3)
+    args = parser.parse_args()
+
+    words = [f"le mot numéro {i}" for i in range(args.cards)]
+    print(f"{'mode':<8}{'1st B/card':>12}{'repeat B/card':>15}{'p50 ms':>9}{'p95 ms':>9}")
+    for mode in ("inline", "url"):
+        r = run(mode, words, args.plays)
+        print(f"{mode:<8}{r['first_play_bytes_per_card']:>12.0f}{r['repeat_play_bytes_per_card']:>15.0f}"
+              f"{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""🔌 熔断器：服务挂掉的那段时间里，每次查询要等多久、有多少请求真的打到服务上、恢复后多久能用
+
+    python bench/bench_breaker.py [--duration 4] [--interval 0.02] [--timeout 0.2] [--outage 1,3]
+
+一个假服务：正常时 10 ms 返回；outage 时间段 (秒) 内每次都要等满 timeout 再失败。
+每隔 interval 秒发一个查询 (上一个没回来就等它)，分别在不加熔断器、加熔断器 (带健康探测)
+两种情况下跑 duration 秒，对比断网期间的延迟、打到服务上的请求数、恢复后多久重新可用。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from breaker import CircuitBreaker, CircuitOpen  # noqa: E402
+
+
+class FlakyService:
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.down = False
+        self.calls = 0
+
+    def __call__(self, query):
+        self.calls += 1
+        if self.down:
+            time.sleep(self.timeout)
+            raise TimeoutError("read timed out")
+        time.sleep(0.01)
+        return query
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+def run(args, use_breaker):
+    service = FlakyService(args.timeout)
+    breaker = CircuitBreaker("bench", failure_threshold=3, reset_after=args.reset_after,
+                             probe=lambda: service("probe"), probe_interval=args.probe_interval)
+    start_down, end_down = (float(x) for x in args.outage.split(","))
+    outage_ms, answered, recovered_at = [], 0, None
+    began = time.perf_counter()
+    i = 0
+    while time.perf_counter() - began < args.duration:
+        now = time.perf_counter() - began
+        down = start_down <= now < end_down
+        service.down = down
+        i += 1
+        start = time.perf_counter()
+        try:
+            (breaker.call if use_breaker else lambda fn, q: fn(q))(service, f"q{i}")
+            ok = True
+        except (TimeoutError, CircuitOpen):
+            ok = False
+        elapsed = time.perf_counter() - start
+        if down:
+            outage_ms.append(elapsed * 1000)
+        elif now >= end_down and ok and recovered_at is None:
+            recovered_at = now - end_down
+        answered += ok
+        time.sleep(max(args.interval - elapsed, 0.0))
+    return {
+        'queries': i,
+        'outage_p50': percentile(outage_ms, 0.5),
+        'outage_p95': percentile(outage_ms, 0.95),
+        'outage_total_s': sum(outage_ms) / 1000,
+        'service_calls': service.calls,
+        'answered': answered,
+        'recovery_s': recovered_at,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between queries")
+    parser.add_argument("--timeout", type=float, default=0.2)
+    parser.add_argument("--outage", default="1,3", help="outage window in seconds, e.g. 1,3")
+    parser.add_argument("--reset-after", type=float, default=30.0)
+    parser.add_argument("--probe-interval", type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(f"{'':<10}{'queries':>8}{'p50 ms':>8}{'p95 ms':>8}{'waited s':>10}{'calls':>7}{'answered':>10}{'recovery s':>12}")
+    for label, use_breaker in (("plain", False), ("breaker", True)):
+        r = run(args, use_breaker)
+        recovery = f"{r['recovery_s']:.2f}" if r['recovery_s'] is not None else "-"
+        print(f"{label:<10}{r['queries']:>8}{r['outage_p50']:>8.1f}{r['outage_p95']:>8.1f}{r['outage_total_s']:>10.2f}"
+              f"{r['service_calls']:>7}{r['answered']:>10}{recovery:>12}")
+    print("(p50/p95/waited: per-query latency during the outage; calls includes health probes)")
+
+
+if __name__ == "__main__":
+    main()
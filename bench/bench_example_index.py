@@ -0,0 +1,116 @@
+"""📝 离线例句索引：建索引吞吐量、索引大小、查询延迟、打开后的内存
+
+    python bench/bench_example_index.py [--sentences 200000] [--queries 20000]
+
+用合成的 Tatoeba 风格 TSV (4 列，法语 + 中文)，前面放几条真句子核对选句：
+原形优先、变形能找到、短语要连着出现、太短的句子不要。有一条不对就以非零状态退出。
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from example_index import ExampleIndex, build_index  # noqa: E402
+
+FIXTURES = [
+    ("Le chat dort sur le canapé.", "猫在沙发上睡觉。"),
+    ("Chat !", "猫！"),
+    ("J'aime les chats noirs.", "我喜欢黑猫。"),
+    ("Nous mangeons des pommes de terre.", "我们吃土豆。"),
+    ("Il y a de la terre sur la pomme.", "苹果上有土。"),
+    ("Elle a parlé avec son frère hier.", "她昨天和她哥哥说话了。"),
+    ("Les journaux sont sur la table.", "报纸在桌子上。"),
+]
+EXPECTED = {
+    'le chat': "Le chat dort sur le canapé.",
+    'parler': "Elle a parlé avec son frère hier.",
+    'la pomme de terre': "Nous mangeons des pommes de terre.",
+    'le journal': "Les journaux sont sur la table.",
+    'zzz': "",
+}
+
+
+def synthetic_word(i):
+    """只用字母 (分词时数字会被丢掉)：0 -> mba, 1 -> mbe ..."""
+    letters = "bcdfglmnprstv"
+    out = ""
+    while True:
+        i, r = divmod(i, len(letters))
+        out += letters[r] + "aeiou"[r % 5]
+        if not i:
+            return "m" + out
+
+
+def write_tsv(path, sentences, vocabulary, seed=0):
+    rng = random.Random(seed)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for i, (fr, tr) in enumerate(FIXTURES):
+            f.write(f"{2 * i}\t{fr}\t{2 * i + 1}\t{tr}\n")
+        for i in range(sentences):
+            words = rng.choices(vocabulary, k=rng.randint(3, 14))
+            f.write(f"{i}\t{' '.join(words).capitalize()}.\t{i}\t译文{i}\n")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=200000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    vocabulary = [synthetic_word(i) for i in range(args.vocabulary)]
+    with tempfile.TemporaryDirectory() as tmp:
+        tsv = os.path.join(tmp, "pairs.tsv.gz")
+        index_path = os.path.join(tmp, "examples")
+        write_tsv(tsv, args.sentences, vocabulary)
+
+        start = time.perf_counter()
+        lines, sentences, terms = build_index(tsv, index_path)
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(index_path, name)) for name in os.listdir(index_path))
+        print(f"build: {lines} lines -> {sentences} sentences, {terms} word forms in {elapsed:.2f}s "
+              f"({lines / elapsed:.0f} lines/s), index {size / 1024 / 1024:.1f} MiB")
+
+        before = rss_mb()
+        index = ExampleIndex(index_path)
+        failures = []
+        for word, expected in EXPECTED.items():
+            got = index.best(word)
+            if got != expected:
+                failures.append(word)
+            print(f"  {'✓' if got == expected else '✗'} {word}: {got!r}")
+        if failures:
+            sys.exit(f"{len(failures)} fixture check(s) failed")
+
+        rng = random.Random(1)
+        for label, words in [
+            ("word", [rng.choice(vocabulary) for _ in range(args.queries)]),
+            ("phrase", [" ".join(rng.choices(vocabulary, k=2)) for _ in range(args.queries // 10)]),
+            ("miss", [synthetic_word(args.vocabulary + i) for i in range(args.queries)]),
+        ]:
+            start = time.perf_counter()
+            for word in words:
+                index.lookup(word)
+            per_query = (time.perf_counter() - start) / len(words)
+            print(f"lookup {label:<7}{per_query * 1e6:>8.1f} µs/query over {len(words)} queries")
+        print(f"RSS after opening + queries: +{rss_mb() - before:.1f} MB (arrays are memory-mapped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""☁️ GitHub 同步：用本地假的 contents API 模拟一轮 50 张卡片的复习
+
+    python bench/bench_github_sync.py [--cards 50] [--latency 0.3]
+
+统计每次点击在 record() 上花的时间；核对提交次数、SHA 冲突合并、表没变时跳过、
+WAL 只删掉已推送的事件和重启后接着推，有一条不对就以非零状态退出。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from github_sync import SyncManager, read_csv_text  # noqa: E402
+from vocab import make_row  # noqa: E402
+
+
+class ConflictError(Exception):
+    status = 409
+
+
+class FakeContents:
+    def __init__(self, path, text, sha):
+        self.path = path
+        self.sha = sha
+        self.decoded_content = text.encode('utf-8')
+
+
+class FakeRepo:
+    """只实现 get_contents / update_file，带网络延迟和 SHA 校验"""
+
+    def __init__(self, text, latency=0.0):
+        self.text = text
+        self.sha = 0
+        self.latency = latency
+        self.commits = 0
+        self.race_next_update = None
+        self._lock = threading.Lock()
+
+    def get_contents(self, path):
+        time.sleep(self.latency)
+        with self._lock:
+            return FakeContents(path, self.text, str(self.sha))
+
+    def update_file(self, path, message, content, sha):
+        time.sleep(self.latency)
+        if self.race_next_update is not None:
+            # 在我们读完远端之后、写回之前，别的设备抢先提交了一次
+            row, self.race_next_update = self.race_next_update, None
+            self.external_edit(row)
+        with self._lock:
+            if sha != str(self.sha):
+                raise ConflictError("sha mismatch")
+            self.text = content
+            self.sha += 1
+            self.commits += 1
+
+    def external_edit(self, row):
+        """模拟别的设备往远端加了一个词"""
+        with self._lock:
+            df = read_csv_text(self.text)
+            self.text = pd.concat([df, pd.DataFrame([row])], ignore_index=True).to_csv(index=False)
+            self.sha += 1
+
+
+def wait_idle(sync, timeout=30.0):
+    """等后台 flush 跑完 (WAL 清空或者出错)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = sync.status()
+        if not status['pending'] or status['last_error']:
+            break
+        time.sleep(0.05)
+    with sync._flush_lock:  # 正在推的那一次也要等它结束
+        return sync.status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake GitHub API latency (s)")
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(ok, what):
+        print(f"  {'✓' if ok else '✗'} {what}")
+        if not ok:
+            failures.append(what)
+
+    table = pd.DataFrame([make_row(f"mot{i}", f"词{i}", "m. (masc)") for i in range(200)])
+    repo = FakeRepo(table.to_csv(index=False), latency=args.latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync = SyncManager(lambda: repo, wal_path=os.path.join(tmp, "wal.jsonl"), debounce=0.5)
+
+        click_ms = []
+        for i in range(args.cards):
+            table.loc[i, ['last_review', 'interval']] = [date.today().isoformat(), 1]
+            start = time.perf_counter()
+            sync.record('grade', [table.loc[i].to_dict()], table)
+            click_ms.append((time.perf_counter() - start) * 1000)
+            if i == args.cards // 2:
+                repo.race_next_update = make_row("le remote", "远端", "m. (masc)")
+        time.sleep(0.5)
+        status = wait_idle(sync)
+
+        remote = read_csv_text(repo.text)
+        print(f"grades: {args.cards}, commits: {repo.commits}, conflicts: {status['conflicts']}, "
+              f"pending after flush: {status['pending']}")
+        print(f"record(): max {max(click_ms):.2f} ms, mean {sum(click_ms) / len(click_ms):.2f} ms per click")
+        check(repo.commits == 1, f"{args.cards} grades -> 1 commit (got {repo.commits})")
+        check(status['conflicts'] >= 1 and 'le remote' in set(remote['word']),
+              "409 conflict merged: the word added on the remote is kept")
+        check(len(remote) == len(table) + 1, f"remote rows {len(remote)} == {len(table) + 1}")
+        check((remote['interval'].astype(int).head(args.cards) == 1).all(), "every local grade kept in the merge")
+        check(status['pending'] == 0 and not sync.pending_events(), "WAL empty after a successful push")
+
+        # 表没变：不提交
+        skipped = sync.status()['skipped']
+        sync.flush()
+        check(repo.commits == 1 and sync.status()['skipped'] > skipped, "unchanged table skipped (no second commit)")
+
+        # 推送途中又来了新事件：只删掉已经推上去的那些
+        slow = SyncManager(lambda: repo, wal_path=os.path.join(tmp, "wal_slow.jsonl"), debounce=60)
+        table.loc[0, 'interval'] = 2
+        slow.record('grade', [table.loc[0].to_dict()], table.copy())
+        pushing = threading.Thread(target=slow.flush)
+        pushing.start()
+        time.sleep(args.latency / 2 or 0.01)  # flush 已经取了快照，正在等假 API
+        table.loc[1, 'interval'] = 2
+        slow.record('grade', [table.loc[1].to_dict()], table.copy())
+        pushing.join()
+        left = slow.pending_events()
+        check(len(left) == 1 and left[0]['row']['word'] == "mot1",
+              f"truncation keeps only the event recorded mid-push ({[e['row']['word'] for e in left]})")
+
+        # 崩溃恢复：没推上去的事件留在 WAL 里 (本地库已经有这些修改)，重启后接着推
+        crash_wal = os.path.join(tmp, "wal_crash.jsonl")
+        SyncManager(lambda: repo, wal_path=crash_wal, debounce=60).record(
+            'insert', [make_row("le crash", "崩溃", "m. (masc)")], table)
+        table = pd.concat([table, pd.DataFrame([make_row("le crash", "崩溃", "m. (masc)")])], ignore_index=True)
+        restarted = SyncManager(lambda: repo, wal_path=crash_wal, debounce=60)
+        check(restarted.status()['pending'] == 1, "unpushed event survives a restart")
+        restarted.flush_soon(table)
+        wait_idle(restarted)
+        check('le crash' in set(read_csv_text(repo.text)['word']) and not restarted.pending_events(),
+              "after restart the pending change is pushed and the WAL cleared")
+
+    if failures:
+        sys.exit(f"{len(failures)} check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
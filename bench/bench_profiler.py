@@ -0,0 +1,54 @@
+"""🐞 剖析开关的开销：关闭时每个 span / count 多花多少
+
+    python bench/bench_profiler.py [--calls 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import profiler  # noqa: E402
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000000)
+    args = parser.parse_args()
+
+    def bare():
+        pass
+
+    def with_span():
+        with profiler.span("bench"):
+            pass
+
+    def with_count():
+        profiler.count("bench")
+
+    @profiler.timed("bench")
+    def decorated():
+        pass
+
+    baseline = per_call_ns(bare, args.calls)
+    print(f"{'':<10}{'span ns':>10}{'count ns':>10}{'timed ns':>10}   (over an empty call, {baseline:.0f} ns)")
+    for on in (False, True):
+        profiler.enable(on)
+        profiler.begin_run("bench")
+        cells = [per_call_ns(fn, args.calls) - baseline for fn in (with_span, with_count, decorated)]
+        profiler.end_run()
+        print(f"{'enabled' if on else 'disabled':<10}" + "".join(f"{ns:>10.0f}" for ns in cells))
+    profiler.enable(False)
+    print(f"ring buffer keeps the last {profiler.RUNS_KEEP} reruns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""📊 复习历史日志：追加吞吐量 (逐条写 vs 攒批)、文件大小、几百万条上的统计耗时和内存
+
+    python bench/bench_review_log.py [--events 5000000] [--appends 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import review_log  # noqa: E402
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def write_synthetic(path, events, words=20000, days=730, seed=0):
+    """直接按 RECORD 格式写一份大日志 (分块，不占太多内存)"""
+    rng = np.random.default_rng(seed)
+    chunk = 1000000
+    with open(path, 'wb') as f:
+        f.write(review_log.HEADER.pack(review_log.MAGIC, review_log.VERSION, review_log.RECORD.itemsize))
+        for start in range(0, events, chunk):
+            n = min(chunk, events - start)
+            records = np.zeros(n, dtype=review_log.RECORD)
+            records['day'] = 19000 + np.sort(rng.integers(0, days, n))
+            records['id'] = rng.integers(1, words + 1, n)
+            records['prev_interval'] = rng.choice([0, 1, 2, 4, 8, 17, 37, 81], n)
+            records['elapsed'] = np.where(records['prev_interval'] == 0, -1, records['prev_interval'] + rng.integers(0, 3, n))
+            # 间隔越长越容易忘
+            records['quality'] = rng.random(n) > 0.05 + records['elapsed'].clip(0) / 200
+            records['interval'] = np.where(records['quality'] == 1, np.maximum(records['prev_interval'] * 2.2, 1), 1)
+            f.write(records.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000000)
+    parser.add_argument("--appends", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'append':<12}{'events/s':>12}{'flushes':>9}")
+        for batch in (1, 32, 256):
+            path = os.path.join(tmp, f"append{batch}.bin")
+            log = review_log.ReviewLog(path, batch=batch, flush_after=60.0)
+            start = time.perf_counter()
+            for i in range(args.appends):
+                log.append(i % 500, i % 4 != 0, "2026-01-01", 4, 8, today="2026-01-05")
+            log.flush()
+            elapsed = time.perf_counter() - start
+            assert len(review_log.read_log(path)) == args.appends
+            print(f"batch={batch:<6}{args.appends / elapsed:>12.0f}{log.flushes:>9}")
+
+        path = os.path.join(tmp, "big.bin")
+        write_synthetic(path, args.events)
+        size = os.path.getsize(path)
+        print(f"\n{args.events} events -> {size / 1024 / 1024:.0f} MiB ({(size - review_log.HEADER.size) / args.events:.0f} bytes/event)")
+
+        before = rss_mb()
+        log = review_log.read_log(path)
+        for name, fn in [
+            ("summary", review_log.summary),
+            ("retention", review_log.retention),
+            ("lapses", review_log.lapses),
+            ("daily", review_log.daily),
+        ]:
+            start = time.perf_counter()
+            result = fn(log)
+            elapsed = time.perf_counter() - start
+            shape = f"{len(result)} rows" if hasattr(result, '__len__') and not isinstance(result, dict) else ""
+            print(f"  {name:<10}{elapsed * 1000:>8.0f} ms  {shape}")
+        print(f"RSS +{rss_mb() - before:.0f} MB while computing (log is memory-mapped)")
+
+
+if __name__ == "__main__":
+    main()
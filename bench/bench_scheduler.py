@@ -0,0 +1,91 @@
+"""📅 组一轮复习：整表比较 + sample vs 调度器堆
+
+    python bench/bench_scheduler.py [--cards 100000] [--size 50] [--sessions 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from scheduler import Scheduler  # noqa: E402
+
+
+def synthetic_frame(n, seed=0):
+    rng = random.Random(seed)
+    today = date.today()
+    return pd.DataFrame({
+        'word': [f"mot{i}" for i in range(n)],
+        'next_review': [(today + timedelta(days=rng.randint(-30, 300))).isoformat() for _ in range(n)],
+        'interval': [rng.choice([0, 1, 2, 4, 9, 20, 44]) for _ in range(n)],
+    })
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def old_session(df, today, size):
+    # 原来的做法：整列字符串比较 -> sample -> shuffle
+    due = df[df['next_review'] <= today]
+    if len(due) > size:
+        due = due.sample(size)
+    queue = due.index.tolist()
+    random.shuffle(queue)
+    return queue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+    today = date.today().isoformat()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    df = synthetic_frame(args.cards)
+    build, sched = timed(lambda: Scheduler.from_frame(df))
+    new, review = sched.due_count(today)
+    print(f"{args.cards} cards, {new} new + {review} review due today; heap build {build:.0f} ms (once per process)")
+
+    old, _ = timed(lambda: old_session(df, today, args.size), repeat=args.sessions)
+    heap, ids = timed(lambda: sched.session(today, args.size), repeat=args.sessions)
+    print(f"build a {args.size}-card session: full scan {old:.2f} ms, heap {heap:.3f} ms ({old / heap:.0f}x)")
+
+    mixed = sched.session(today, args.size, new_limit=5)
+    print(f"new_limit=5: {sum(1 for i in mixed if df.at[i, 'interval'] == 0)} new of {len(mixed)}")
+
+    # 把整轮都打完分：每张 reschedule 到明天以后，下一轮不该再出现
+    queue = deque(ids)
+    grade, _ = timed(lambda: [sched.reschedule(queue.popleft(), tomorrow, 1) for _ in range(len(ids))])
+    again = sched.session(today, args.size)
+    assert not set(ids) & set(again), "graded cards came back in the next session"
+    print(f"reschedule: {grade / len(ids) * 1000:.1f} µs per card; next session has {len(again)} fresh cards")
+
+    # 调回以前用过的 (next_review, interval)：比如倍率 2.2 -> 2.5 -> 2.2 整体重排，旧条目不能复活
+    small = Scheduler([(1, "2026-10-10", 4), (2, "2026-10-11", 3)])
+    small.reschedule(1, "2026-10-12", 5)
+    small.reschedule(1, "2026-10-10", 4)
+    twice = small.session("2026-10-31", shuffle=False)
+    assert twice == [1, 2], f"card scheduled twice in one session: {twice}"
+    print("rescheduled back to an old slot: each card once per session")
+
+    # 连续打很多轮分，旧条目不会把堆撑大
+    for _ in range(args.sessions):
+        for row_id in sched.session(today, args.size):
+            sched.reschedule(row_id, tomorrow, 1)
+    print(f"after {args.sessions} graded sessions: heap entries {len(sched._new) + len(sched._review)} for {len(sched)} cards")
+
+
+if __name__ == "__main__":
+    main()
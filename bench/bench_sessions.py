@@ -0,0 +1,121 @@
+"""🏪 多会话压测：同一进程里开很多个 Streamlit 会话同时复习
+
+    python bench/bench_sessions.py [--sessions 20] [--cards 20000] [--grades 10]
+
+每个会话用 AppTest 跑一遍 Review 模式，然后所有会话轮流 翻卡 + 打分
+(AppTest 不能多线程同时驱动，所以是交错执行；cache_resource 的单例照样被它们共用)，
+报告进程 RSS 随会话数的增长和每次 rerun 的延迟。发音用本地假渲染器。
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import audio_cache  # noqa: E402
+import review_log  # noqa: E402
+from bench_storage import synthetic_csv  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+audio_cache.render_gtts = lambda text, lang='fr', slow=False: b"ID3" + text.encode('utf-8')
+
+# App 里的打分日志是 cache_resource 单例，记下来好在删临时目录之前 flush
+review_logs = []
+_review_log_init = review_log.ReviewLog.__init__
+
+
+def _track_review_log(self, *args, **kwargs):
+    _review_log_init(self, *args, **kwargs)
+    review_logs.append(self)
+
+
+review_log.ReviewLog.__init__ = _track_review_log
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def open_session():
+    at = AppTest.from_file(os.path.join(ROOT, "words_app.py"), default_timeout=120).run()
+    at.sidebar.radio[0].set_value("📖 Review").run()
+    return at
+
+
+def grade_once(at, rng, timings):
+    """翻一张卡再打分，两次 rerun 都计时；队列空了返回 False"""
+    buttons = {b.label: b for b in at.button}
+    if "🔍 Voir" not in buttons:
+        return False
+    start = time.perf_counter()
+    buttons["🔍 Voir"].click().run()
+    timings.append(time.perf_counter() - start)
+    buttons = {b.label: b for b in at.button}
+    start = time.perf_counter()
+    buttons[rng.choice(["🍷 Délicieux", "🧂 Trop Salé"])].click().run()
+    timings.append(time.perf_counter() - start)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--grades", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(tmp)
+        synthetic_csv("vocab.csv", args.cards)
+        os.makedirs(".streamlit")
+        open(".streamlit/secrets.toml", "w").close()
+
+        base = rss_mb()
+        start = time.perf_counter()
+        sessions = [open_session()]
+        first_session = time.perf_counter() - start
+        after_first = rss_mb()
+        sessions += [open_session() for _ in range(args.sessions - 1)]
+        after_all = rss_mb()
+
+        rng = random.Random(0)
+        timings = []
+        for _ in range(args.grades):
+            for at in sessions:
+                grade_once(at, rng, timings)
+        timings.sort()
+        errors = sum(len(at.exception) for at in sessions)
+
+        print(f"deck: {args.cards} cards, sessions: {args.sessions}, reruns measured: {len(timings)}, errors: {errors}")
+        print(f"first session (loads shared deck): {first_session * 1000:.0f} ms")
+        print(f"RSS: base {base:.0f} MB, after 1 session {after_first:.0f} MB, "
+              f"after {args.sessions} sessions {after_all:.0f} MB "
+              f"(~{(after_all - after_first) / max(args.sessions - 1, 1):.1f} MB per extra session)")
+        if timings:
+            print(f"rerun latency: p50 {timings[len(timings) // 2] * 1000:.0f} ms, "
+                  f"p95 {timings[int(len(timings) * 0.95)] * 1000:.0f} ms")
+    finally:
+        for log in review_logs:
+            log.flush()  # 缓冲清空、定时器取消，退出时的 atexit flush 就什么都不写
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
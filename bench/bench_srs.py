@@ -0,0 +1,79 @@
+"""📈 整副牌的预测和批量改期：NumPy 数组 vs 逐行 Python
+
+    python bench/bench_srs.py [--cards 100000]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import srs  # noqa: E402
+from bench_scheduler import synthetic_frame  # noqa: E402
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def per_row_forecast(next_reviews, today, days):
+    counts = Counter()
+    for value in next_reviews:
+        offset = max((date.fromisoformat(value) - today).days, 0)
+        if offset < days:
+            counts[offset] += 1
+    return [counts[i] for i in range(days)]
+
+
+def per_row_intervals(intervals, qualities):
+    # 原来 update_word_progress 的写法
+    out = []
+    for interval, quality in zip(intervals, qualities):
+        out.append(1 if quality == 0 else (1 if interval == 0 else int(interval * 2.2)))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100000)
+    args = parser.parse_args()
+    today = date.today()
+
+    df = synthetic_frame(args.cards)
+    df['last_review'] = [(today - timedelta(days=i % 40)).isoformat() if iv else None
+                         for i, iv in enumerate(df['interval'])]
+    convert, due = timed(lambda: srs.to_days(df['next_review']))
+    last_review = srs.to_days(df['last_review'])
+    intervals = df['interval'].to_numpy(dtype=np.int32)
+    print(f"{args.cards} cards; string -> datetime64 conversion {convert:.1f} ms (cached per table version)")
+
+    vec, counts = timed(lambda: srs.forecast(due, today, 365), repeat=20)
+    row, expected = timed(lambda: per_row_forecast(df['next_review'].tolist(), today, 365))
+    assert counts.tolist() == expected
+    print(f"365-day forecast: numpy {vec:.2f} ms, per-row {row:.0f} ms")
+
+    qualities = np.random.default_rng(0).integers(0, 2, len(intervals))
+    vec, new = timed(lambda: srs.next_intervals(intervals, qualities), repeat=20)
+    row, expected = timed(lambda: per_row_intervals(intervals.tolist(), qualities.tolist()))
+    assert new.tolist() == expected, "vectorized rule differs from the per-row rule"
+    print(f"grade every card: numpy {vec:.2f} ms, per-row {row:.0f} ms")
+
+    ms, (spread, moved) = timed(lambda: srs.spread_overdue(due, today, 7))
+    print(f"spread {len(moved)} overdue cards over 7 days: {ms:.2f} ms, "
+          f"max per day {srs.forecast(spread, today, 7).max()}")
+
+    ms, (_, _, changed) = timed(lambda: srs.rescale(intervals, last_review, 2.2, 2.5, today))
+    print(f"rescale x2.2 -> x2.5: {len(changed)} cards in {ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""🚀 冷启动：每种模式从起进程到第一次画完页面要多久
+
+    python bench/bench_startup.py [--budget-ms 4000] [--cards 2000] [--eager]
+
+每个模式起一个全新的 `python -X importtime` 子进程，用 AppTest 跑 words_app.py，
+报告总耗时、脚本本身的耗时、import 最慢的顶层包，以及可选集成 (gtts, github …) 有没有被加载。
+超过预算时退出码为 1，可以放进 CI。--eager 先把可选集成全部 import 一遍，作为对照。
+网络都被换成了本地假实现 (发音是假 mp3，不配 GitHub)，所以只测 import 和渲染。
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BENCH = os.path.dirname(os.path.abspath(__file__))
+OPTIONAL = ("gtts", "deep_translator", "github", "bs4", "requests")
+MODES = {"dictionnaire": "🔍 Dictionnaire", "review": "📖 Review"}
+
+
+def child(mode, eager):
+    # 在子进程里跑：打印一行 JSON
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCH)
+    if eager:
+        for name in OPTIONAL:
+            __import__(name)
+    import audio_cache
+    audio_cache.render_gtts = lambda text, lang='fr', slow=False: b"ID3" + text.encode('utf-8')
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, "words_app.py"), default_timeout=120).run()
+    if mode != "dictionnaire":
+        at.sidebar.radio[0].set_value(MODES[mode]).run()
+    rendered = time.perf_counter()
+    print(json.dumps({
+        'mode': mode,
+        'harness_ms': (imported - start) * 1000,
+        'script_ms': (rendered - imported) * 1000,
+        'errors': len(at.exception),
+        'loaded': [name for name in OPTIONAL if name in sys.modules],
+        'ts': time.time(),
+    }))
+
+
+def top_imports(stderr, n=6):
+    """-X importtime 输出里累计耗时最长的顶层包"""
+    totals = {}
+    for line in stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", line)
+        if m:  # 没有缩进的名字就是顶层 import
+            totals[m.group(2)] = int(m.group(1)) / 1000
+    return sorted(totals.items(), key=lambda kv: -kv[1])[:n]
+
+
+def run_mode(mode, eager):
+    cmd = [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", mode]
+    if eager:
+        cmd.append("--eager")
+    spawned = time.time()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        sys.exit(f"{mode}: child failed\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    result['first_render_ms'] = (result['ts'] - spawned) * 1000
+    result['top'] = top_imports(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=4000, help="time-to-first-render budget per mode")
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--eager", action="store_true", help="import every optional integration up front")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.eager)
+
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCH)
+    from bench_storage import synthetic_csv
+
+    tmp = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    over = []
+    try:
+        os.chdir(tmp)
+        synthetic_csv("vocab.csv", args.cards)
+        os.makedirs(".streamlit")
+        open(".streamlit/secrets.toml", "w").close()
+        for mode in MODES:
+            shutil.rmtree(".cache", ignore_errors=True)  # 每次都是空缓存、新库
+            for path in ("vocab.db", "vocab.db-wal", "vocab.db-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            r = run_mode(mode, args.eager)
+            flag = "OVER BUDGET" if r['first_render_ms'] > args.budget_ms else "ok"
+            if flag != "ok":
+                over.append(mode)
+            print(f"{mode:<13} first render {r['first_render_ms']:6.0f} ms  "
+                  f"(harness imports {r['harness_ms']:.0f} ms, app script {r['script_ms']:.0f} ms)  "
+                  f"budget {args.budget_ms:.0f} ms: {flag}  errors: {r['errors']}")
+            print(f"{'':<13} optional integrations loaded: {', '.join(r['loaded']) or 'none'}")
+            print(f"{'':<13} slowest imports: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in r['top']))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+    if over:
+        sys.exit(f"over budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""💾 存储后端：50k 张卡片时的启动、取到期卡片和打分延迟
+
+    python bench/bench_storage.py [--cards 50000] [--grades 200]
+
+对比旧的整表 CSV 读取、CSVStore 和 SQLiteStore。
+startup = 打开存储 + load_frame()，也就是 App 启动时真正要等的时间。
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from storage import CSVStore, SQLiteStore, read_vocab_csv  # noqa: E402
+from vocab import make_row  # noqa: E402
+
+
+def synthetic_csv(path, n):
+    rng = random.Random(0)
+    today = date.today()
+    rows = []
+    for i in range(n):
+        row = make_row(f"mot{i}", f"词{i}", rng.choice(["m. (masc)", "f. (fem)", "v. (verb)"]), f"Exemple {i}.")
+        row['next_review'] = (today + timedelta(days=rng.randint(-30, 300))).isoformat()
+        row['interval'] = rng.choice([0, 1, 2, 4, 9, 20])
+        rows.append(row)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def open_and_load(cls, path):
+    store = cls(path)
+    store.load_frame()
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=50000)
+    parser.add_argument("--grades", type=int, default=200)
+    args = parser.parse_args()
+    today = date.today().isoformat()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "vocab.csv")
+        db_path = os.path.join(tmp, "vocab.db")
+        synthetic_csv(csv_path, args.cards)
+
+        ms, _ = timed(lambda: SQLiteStore(db_path).import_csv(csv_path))
+        print(f"migrate {args.cards} rows CSV -> SQLite: {ms:.0f} ms")
+        print()
+        print(f"{'':<14}{'startup ms':>12}{'due query ms':>14}{'grade ms':>10}")
+
+        # 旧做法：每个新会话都整表读 CSV 并重新解析日期，打分只改内存
+        startup, df = timed(lambda: read_vocab_csv(csv_path))
+        due, _ = timed(lambda: df[df['next_review'] <= today].index.tolist(), repeat=20)
+        ids = random.Random(1).sample(range(args.cards), args.grades)
+        grade, _ = timed(lambda: [df.loc.__setitem__((i, ['last_review', 'next_review', 'interval']),
+                                                     [today, today, 1]) for i in ids])
+        print(f"{'old (memory)':<14}{startup:>12.1f}{due:>14.2f}{grade / len(ids):>10.3f}")
+
+        startup, store = timed(lambda: open_and_load(CSVStore, csv_path))
+        due, _ = timed(lambda: store.due_ids(today), repeat=20)
+        grade, _ = timed(lambda: [store.update_progress(i, today, today, 1) for i in ids[:10]])
+        print(f"{'CSVStore':<14}{startup:>12.1f}{due:>14.2f}{grade / 10:>10.3f}")
+
+        startup, store = timed(lambda: open_and_load(SQLiteStore, db_path))
+        connect, _ = timed(lambda: SQLiteStore(db_path))
+        due, due_ids = timed(lambda: store.due_ids(today), repeat=20)
+        grade, _ = timed(lambda: [store.update_progress(i + 1, today, today, 1) for i in ids])
+        print(f"{'SQLiteStore':<14}{startup:>12.1f}{due:>14.2f}{grade / len(ids):>10.3f}")
+        print(f"  ({len(due_ids)} due cards; SQLite connect alone {connect:.1f} ms, the rest is load_frame)")
+
+
+if __name__ == "__main__":
+    main()
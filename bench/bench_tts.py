@@ -0,0 +1,96 @@
+"""🗣️ TTS 吞吐量：每秒能合成多少句，逐条 vs ensure_many 线程池，以及断网时退到本地引擎的开销
+
+    python bench/bench_tts.py [--words 200] [--workers 1,2,4,8] [--latency 0.15] [--network]
+
+本机装了 espeak-ng / piper 就测真的；另外总会测一个按 --latency sleep 的合成后端
+(模拟 gTTS 一次网络往返)。--network 才会真的去调 gTTS。
+fallback 一行：主后端每次等 --timeout 秒后失败，看熔断器跳闸后整体吞吐量恢复到多少。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_cache import AudioCache  # noqa: E402
+from tts import LOCAL_BACKENDS, FallbackBackend, GTTSBackend  # noqa: E402
+
+
+class SyntheticBackend:
+    """假装一次网络往返：sleep 之后返回一段 mp3 大小的字节"""
+
+    def __init__(self, latency, name="synthetic"):
+        self.latency = latency
+        self.name = name
+
+    def available(self):
+        return True
+
+    def __call__(self, text, lang='fr', slow=False):
+        time.sleep(self.latency)
+        return b"ID3" + text.encode('utf-8') * 64
+
+
+class DeadBackend(SyntheticBackend):
+    """每次都等满超时再失败"""
+
+    def __call__(self, text, lang='fr', slow=False):
+        time.sleep(self.latency)
+        raise TimeoutError("read timed out")
+
+
+def words(n, tag):
+    return [f"{tag} mot numéro {i}" for i in range(n)]
+
+
+def throughput(backend, texts, workers):
+    """workers=0: 逐条 ensure (原来的做法)；否则一次 ensure_many"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = AudioCache(cache_dir, renderer=backend)
+        start = time.perf_counter()
+        failed = []
+        if workers == 0:
+            for text in texts:
+                try:
+                    cache.ensure(text)
+                except Exception:
+                    failed.append(text)
+        else:
+            _, failed = cache.ensure_many(texts, workers=workers)
+        elapsed = time.perf_counter() - start
+    return (len(texts) - len(failed)) / elapsed, len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--latency", type=float, default=0.15, help="synthetic backend latency (s)")
+    parser.add_argument("--timeout", type=float, default=0.5, help="how long the dead primary waits before failing")
+    parser.add_argument("--network", action="store_true", help="also benchmark the real gTTS")
+    args = parser.parse_args()
+    pools = [int(w) for w in args.workers.split(",")]
+
+    backends = [SyntheticBackend(args.latency)]
+    backends += [backend for backend in (cls() for cls in LOCAL_BACKENDS) if backend.available()]
+    if args.network:
+        backends.append(GTTSBackend())
+    local = next((b for b in backends[1:] if b.name != "gtts"), SyntheticBackend(0.02, name="local~20ms"))
+    backends.append(FallbackBackend(DeadBackend(args.timeout, name="dead"), local))
+
+    print(f"{'backend':<20}{'sequential':>12}" + "".join(f"{f'pool={w}':>10}" for w in pools) + "   (utterances/s)")
+    for backend in backends:
+        cells = []
+        for workers in [0] + pools:
+            if isinstance(backend, FallbackBackend):
+                backend.breaker.reset()  # 每一列都从服务刚挂掉开始
+            rate, failed = throughput(backend, words(args.words, f"{backend.name}{workers}"), workers)
+            cells.append(f"{rate:.1f}" + ("!" if failed else ""))
+        print(f"{backend.name:<20}" + f"{cells[0]:>12}" + "".join(f"{cell:>10}" for cell in cells[1:]))
+    print("(! = some utterances failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""📚 离线 Wiktionary 索引：建索引吞吐量和单词查询延迟
+
+    python bench/bench_wiktionary_index.py [--pages 50000]
+    python bench/bench_wiktionary_index.py --pages 0      # 只跑词条抽取的核对
+
+用合成的小型 XML.bz2 dump (格式和 frwiktionary pages-articles 一致)。
+先核对几种典型词条的抽取结果 (包括非法语词条和 ns 10 的模板页)，有一条不对就以非零状态退出。
+"""
+import argparse
+import bz2
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wiktionary_index import WiktionaryIndex, build_index, extract_pos  # noqa: E402
+
+HEADER = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xml:lang="fr">\n'
+PAGE = """  <page>
+    <title>{title}</title>
+    <ns>{ns}</ns>
+    <revision><text xml:space="preserve">{text}</text></revision>
+  </page>
+"""
+
+FIXTURES = {
+    'chat': ("== {{langue|fr}} ==\n=== {{S|nom|fr}} ===\n{{fr-rég|ʃa}}\n'''chat''' {{pron|ʃa|fr}} {{m}}\n"
+             "# Mammifère.\n\n== {{langue|en}} ==\n=== {{S|nom|en}} ===\n'''chat'''\n", "m. (masc)"),
+    'maison': ("== {{langue|fr}} ==\n=== {{S|nom|fr}} ===\n'''maison''' {{pron|mɛ.zɔ̃|fr}} {{f}}\n", "f. (fem)"),
+    'manger': ("== {{langue|fr}} ==\n=== {{S|verbe|fr}} ===\n'''manger''' {{pron|mɑ̃.ʒe|fr}} {{t|fr}}\n", "v. (verb)"),
+    'rapide': ("== {{langue|fr}} ==\n=== {{S|adjectif|fr}} ===\n'''rapide''' {{pron|ʁa.pid|fr}} {{mf}}\n", "adj."),
+    'ancien': ("== {{langue|fr}} ==\n=== {{-nom-|fr}} ===\n'''ancien''' {{pron|ɑ̃.sjɛ̃|fr}}\n", "n. (noun)"),
+    'dog': ("== {{langue|en}} ==\n=== {{S|nom|en}} ===\n'''dog''' {{m}}\n", None),
+}
+
+# 模板页 (ns 10) 的内容即使像一个法语名词也不能进索引
+TEMPLATE = ("Modèle:m", "== {{langue|fr}} ==\n=== {{S|nom|fr}} ===\n{{m}}\n")
+
+
+def write_dump(path, pages):
+    with bz2.open(path, 'wt', encoding='utf-8') as f:
+        f.write(HEADER)
+        for title, (text, _) in FIXTURES.items():
+            f.write(PAGE.format(title=title, ns=0, text=text))
+        f.write(PAGE.format(title=TEMPLATE[0], ns=10, text=TEMPLATE[1]))
+        for i in range(pages):
+            gender = "{{m}}" if i % 2 else "{{f}}"
+            text = f"== {{{{langue|fr}}}} ==\n=== {{{{S|nom|fr}}}} ===\n'''mot{i}''' {{{{pron|mo|fr}}}} {gender}\n# Définition.\n"
+            f.write(PAGE.format(title=f"mot{i}", ns=0, text=text))
+        f.write("</mediawiki>\n")
+
+
+def check_fixtures(index):
+    """每个词条既直接过 extract_pos，也从建好的索引里查；返回不对的那些"""
+    failures = []
+    cases = [(word, text, expected) for word, (text, expected) in FIXTURES.items()]
+    cases.append((TEMPLATE[0], None, None))
+    for word, text, expected in cases:
+        got = {'index': index.lookup(word)}
+        if text is not None:
+            got['extract_pos'] = extract_pos(text)
+        ok = all(value == expected for value in got.values())
+        if not ok:
+            failures.append(word)
+        print(f"  {'✓' if ok else '✗'} {word}: {got} (expected {expected!r})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = os.path.join(tmp, "fixture.xml.bz2")
+        index_path = os.path.join(tmp, "index.sqlite")
+        write_dump(dump, args.pages)
+
+        start = time.perf_counter()
+        pages, written = build_index(dump, index_path)
+        elapsed = time.perf_counter() - start
+        print(f"build: {pages} pages -> {written} entries in {elapsed:.2f}s "
+              f"({pages / elapsed:.0f} pages/s), index {os.path.getsize(index_path) / 1024:.0f} KiB")
+
+        index = WiktionaryIndex(index_path)
+        failures = check_fixtures(index)
+        if failures:
+            sys.exit(f"{len(failures)} fixture check(s) failed")
+        if not args.pages:
+            return
+
+        words = [f"mot{i % args.pages}" for i in range(0, args.queries * 7, 7)]
+        start = time.perf_counter()
+        for word in words:
+            index.lookup(word)
+        per_query = (time.perf_counter() - start) / len(words)
+        print(f"lookup: {per_query * 1e6:.1f} µs/query over {len(words)} queries")
+
+
+if __name__ == "__main__":
+    main()
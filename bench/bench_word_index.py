@@ -0,0 +1,63 @@
+"""🔤 词表查找：全表 lowercase 扫描 vs WordIndex (精确/前缀/模糊)
+
+    python bench/bench_word_index.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from word_index import WordIndex  # noqa: E402
+
+
+def synthetic_words(n, seed=0):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase + "éèàç"
+    words = set()
+    while len(words) < n:
+        stem = "".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        words.add(rng.choice(["le ", "la ", "l'", ""]) + stem)
+    return list(words)
+
+
+def per_query_us(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'build ms':>10}{'scan µs':>10}{'exact µs':>10}{'prefix µs':>11}{'fuzzy µs':>10}")
+    for n in args.sizes:
+        words = synthetic_words(n)
+        df = pd.DataFrame({'word': words})
+        rng = random.Random(1)
+        queries = [w.split(" ")[-1].split("'")[-1].upper() for w in rng.sample(words, args.queries)]
+        typos = [q[:-1] + "x" for q in queries]
+
+        start = time.perf_counter()
+        index = WordIndex.from_series(df['word'])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # 旧做法只跑少量查询，大表上太慢
+        scan = per_query_us(lambda q: df[df['word'].str.lower() == q.lower()], queries[:50])
+        exact = per_query_us(index.exact, queries)
+        prefix = per_query_us(lambda q: index.prefix(q[:3]), queries)
+        fuzzy = per_query_us(index.fuzzy, typos)
+        print(f"{n:>8}{build_ms:>10.0f}{scan:>10.0f}{exact:>10.1f}{prefix:>11.1f}{fuzzy:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""🧪 四个外部服务的本地替身：Google 翻译、Wiktionary、gTTS、GitHub
+
+    from stubs import Stubs
+    stubs = Stubs(latency={'translation': 0.15}, failure_rate=0.05).install()
+
+每个替身按配置的延迟 (0.5x ~ 1.5x 抖动) sleep，再按 failure_rate 随机抛异常，
+调用次数和失败次数记在 stubs.calls / stubs.failures 里。
+GitHub 换成一个假的 github 模块 (Github / Auth)，背后是 bench_github_sync.FakeRepo，
+不需要装 PyGithub，也不会联网。要在 words_app 第一次运行之前 install()。
+"""
+import os
+import random
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import audio_cache  # noqa: E402
+import lookup  # noqa: E402
+from bench_github_sync import FakeRepo  # noqa: E402
+
+DEFAULT_LATENCY = {'translation': 0.15, 'wiktionary': 0.3, 'tts': 0.1, 'github': 0.3}
+
+
+class StubFailure(Exception):
+    pass
+
+
+class Stubs:
+    def __init__(self, latency=None, failure_rate=0.0, seed=0, remote_csv="word,meaning,gender,example\n"):
+        self.latency = dict(DEFAULT_LATENCY, **(latency or {}))
+        self.failure_rate = failure_rate
+        self.calls = dict.fromkeys(self.latency, 0)
+        self.failures = dict.fromkeys(self.latency, 0)
+        self.repo = FakeRepo(remote_csv, latency=self.latency['github'])
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _service(self, name):
+        with self._lock:
+            self.calls[name] += 1
+            delay = self.latency[name] * self._rng.uniform(0.5, 1.5)
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures[name] += 1
+        time.sleep(delay)
+        if fail:
+            raise StubFailure(f"{name} stub failure")
+
+    # --- 替身 ---
+    def translate(self, text, timeout=None):
+        self._service('translation')
+        return f"译:{text}"
+
+    def wiktionary(self, word, timeout=5, session=None, index=None):
+        if index is not None:
+            pos = index.lookup(word.strip().lower())
+            if pos:
+                return pos
+        self._service('wiktionary')
+        return random.choice(["m. (masc)", "f. (fem)", "v. (verb)"])
+
+    def tts(self, text, lang='fr', slow=False):
+        self._service('tts')
+        return b"ID3" + text.encode('utf-8') * 64  # 大小差不多是一个很短的 mp3
+
+    def github_module(self):
+        stubs = self
+
+        class Github:
+            def __init__(self, auth=None):
+                pass
+
+            def get_repo(self, name):
+                stubs._service('github')
+                return stubs.repo
+
+        module = types.ModuleType("github")
+        module.Github = Github
+        module.Auth = types.SimpleNamespace(Token=lambda token: token)
+        return module
+
+    def install(self):
+        lookup.fetch_translation = self.translate
+        lookup.fetch_wiktionary_pos = self.wiktionary
+        audio_cache.render_gtts = self.tts
+        sys.modules['github'] = self.github_module()
+        return self
@@ -0,0 +1,156 @@
+"""🔌 熔断器：外部服务连续失败几次就跳闸，之后的调用立刻失败，不再每次都等满超时
+
+    closed     正常放行；连续失败 failure_threshold 次 -> open
+    open       直接抛 CircuitOpen；后台线程每 probe_interval 秒探一次，探通了 -> closed
+               过了 reset_after 秒还没探通，就放一个真实请求去试 -> half_open
+    half_open  只放这一个请求：成功 -> closed，失败 -> 重新 open
+
+整个进程共用一个实例 (见 lookup.BREAKERS)，所有会话一起感知服务挂了。
+"""
+import threading
+import time
+
+import profiler
+
+
+class CircuitOpen(Exception):
+    """熔断中：没有真的发请求"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} unavailable, retrying in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=3, reset_after=30.0, probe=None, probe_interval=10.0,
+                 on_recover=None, clock=time.monotonic):
+        """probe: 无参函数，能正常返回就说明服务恢复了 (抛异常 = 还没好)
+        on_recover: 从熔断恢复时调用 (比如清掉断网期间记下的失败结果)
+        """
+        self.name = name
+        self.on_recover = on_recover
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0        # 连续失败次数
+        self._opened_at = 0.0
+        self._prober = None
+
+        self.trips = 0
+        self.rejected = 0
+        self.last_error = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._on_failure(e)
+            raise
+        self._on_success()
+        return result
+
+    def status(self):
+        with self._lock:
+            retry_in = max(self.reset_after - (self._clock() - self._opened_at), 0.0) if self._state != "closed" else 0.0
+            return {
+                'state': self._state,
+                'failures': self._failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'retry_in': retry_in,
+                'last_error': self.last_error,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._close()
+
+    def record_failure(self, error):
+        """调用方自己判定的失败 (比如等过了截止时间还没返回的请求)，和 call() 里抛异常一样计数"""
+        self._on_failure(error)
+
+    # --- 状态切换 (都在 self._lock 里) ---
+    def _before_call(self):
+        with self._lock:
+            if self._state == "closed":
+                return
+            elapsed = self._clock() - self._opened_at
+            if self._state == "open" and elapsed >= self.reset_after:
+                self._state = "half_open"  # 放这一个请求过去，其余的继续快速失败
+                return
+            self.rejected += 1
+            retry_in = max(self.reset_after - elapsed, 0.0)
+        profiler.count(f"breaker.{self.name}.rejected")
+        raise CircuitOpen(self.name, retry_in)
+
+    def _on_success(self):
+        with self._lock:
+            recovered = self._state != "closed"
+            if recovered or self._failures:
+                self._close()
+        if recovered:
+            self._recovered()
+
+    def _on_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self._state == "half_open" or (self._state == "closed" and self._failures >= self.failure_threshold):
+                self._trip()
+
+    def _trip(self):
+        self._state = "open"
+        self._opened_at = self._clock()
+        self.trips += 1
+        profiler.count(f"breaker.{self.name}.open")
+        if self.probe is not None and self._prober is None:
+            self._prober = threading.Thread(target=self._probe_loop, name=f"probe-{self.name}", daemon=True)
+            self._prober.start()
+
+    def _close(self):
+        self._state = "closed"
+        self._failures = 0
+
+    def _recovered(self):
+        # 在锁外调用：回调里可能还要查状态
+        if self.on_recover is not None:
+            try:
+                self.on_recover()
+            except Exception:
+                pass
+
+    # --- 后台健康探测 ---
+    def _probe_loop(self):
+        try:
+            while True:
+                time.sleep(self.probe_interval)
+                with self._lock:
+                    if self._state == "closed":
+                        return  # 真实请求已经试通了
+                try:
+                    self.probe()
+                except Exception as e:
+                    with self._lock:
+                        self.last_error = f"{type(e).__name__}: {e}"
+                    continue
+                profiler.count(f"breaker.{self.name}.probe_ok")
+                with self._lock:
+                    recovered = self._state != "closed"
+                    self._close()
+                if recovered:
+                    self._recovered()
+                return
+        finally:
+            with self._lock:
+                self._prober = None
@@ -0,0 +1,164 @@
+"""📦 批量导入：一次性给一串法语单词补上翻译、词性和发音，整批写进词表
+
+    python bulk_import.py words.txt [--vocab vocab.db] [--workers 8] [--rate 5] [--no-audio]
+
+输入可以是一行一个词的纯文本，也可以是带 word 列的 CSV。
+--vocab 默认是 App 用的 vocab.db；给 .csv 路径就写 CSV。正在运行的 App 重启后才能看到新词。
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import example_index
+from lookup import LookupConfig, call_with_retries, fetch_translation, fetch_wiktionary_pos
+from storage import open_path
+from wiktionary_index import open_index
+from vocab import make_row, strip_article, with_article
+
+
+class RateLimiter:
+    """简单的匀速限流：两次调用之间至少隔 1/rate 秒，线程安全"""
+
+    def __init__(self, rate_per_sec):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_word_list(text):
+    """纯文本一行一个词；CSV 有 word 列就取 word 列，否则取第一列"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    rows = list(csv.reader(lines))
+    header = [c.strip().lower() for c in rows[0]]
+    if 'word' in header:
+        col = header.index('word')
+        rows = rows[1:]
+    else:
+        col = 0
+    return [row[col].strip() for row in rows if len(row) > col and row[col].strip()]
+
+
+def default_translate(word):
+    cfg = LookupConfig()
+    return call_with_retries(fetch_translation, word, retries=cfg.retries['translation'], backoff=cfg.backoff)
+
+
+def default_pos(word, index=None):
+    cfg = LookupConfig()
+    return call_with_retries(fetch_wiktionary_pos, word, timeout=cfg.timeouts['gender'], index=index,
+                             retries=cfg.retries['gender'], backoff=cfg.backoff)
+
+
+def enrich_words(words, existing=(), translate=default_translate, pos=default_pos,
+                 example=None, audio_cache=None, workers=8, rate=5.0, progress=None):
+    """并发查询每个新词，返回 (新行列表, 失败的词列表)
+
+    existing: 已有的词，忽略大小写和冠词去重 (chat 和 le chat 算同一个词)
+    example: example(word) -> 例句 (离线索引，不限速)；None 就留空
+    rate: 每个外部服务每秒最多发多少个请求
+    progress: progress(完成数, 总数)，在调用线程里回调，可以直接更新 UI
+    """
+    seen = {strip_article(w) for w in existing}
+    todo = []
+    for word in words:
+        key = strip_article(word)
+        if key and key not in seen:
+            seen.add(key)
+            todo.append(word.strip())
+
+    limits = {name: RateLimiter(rate) for name in ('translation', 'gender', 'tts')}
+
+    def enrich(word):
+        limits['translation'].wait()
+        meaning = translate(word)
+        if not meaning:
+            raise ValueError("no translation")
+        limits['gender'].wait()
+        try:
+            gender = pos(word)
+        except Exception:
+            gender = "Unknown"
+        final_word = with_article(word, gender)
+        if audio_cache is not None:
+            limits['tts'].wait()
+            try:
+                audio_cache.ensure(final_word)
+            except Exception:
+                pass  # 发音之后播放时还能再补
+        return make_row(final_word, meaning, gender, example(final_word) if example else "")
+
+    rows, failed = [], []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-import") as pool:
+        futures = {pool.submit(enrich, word): word for word in todo}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                row = future.result()
+            except Exception:
+                failed.append(futures[future])
+            else:
+                rows.append(row)
+            if progress:
+                progress(done, len(todo))
+    return rows, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-enrich a French word list into the vocabulary")
+    parser.add_argument("words", help="word list (.txt one per line, or .csv with a 'word' column)")
+    parser.add_argument("--vocab", default="vocab.db", help="vocab.db (SQLite, what the app uses) or a .csv")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="max requests/sec per service")
+    parser.add_argument("--no-audio", action="store_true", help="skip TTS pre-rendering")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    with io.open(args.words, encoding='utf-8') as f:
+        words = read_word_list(f.read())
+    store = open_path(args.vocab)
+    existing = store.load_frame()['word'].tolist()
+
+    audio_cache = None
+    if not args.no_audio:
+        from audio_cache import AudioCache
+        from tts import make_backend
+        audio_cache = AudioCache(os.path.join(os.path.dirname(os.path.abspath(args.vocab)), "static", "audio"),
+                                 renderer=make_backend())
+
+    start = time.perf_counter()
+
+    def report(done, total):
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    index = open_index()
+    examples = example_index.open_index()
+    rows, failed = enrich_words(words, existing, pos=lambda word: default_pos(word, index),
+                                example=examples.best if examples else None, audio_cache=audio_cache,
+                                workers=args.workers, rate=args.rate, progress=report)
+    print(file=sys.stderr)
+    if not args.dry_run and rows:
+        store.add_many(rows)
+    print(f"added {len(rows)}, failed {len(failed)}, skipped {len(words) - len(rows) - len(failed)} "
+          f"in {time.perf_counter() - start:.1f}s")
+    for word in failed:
+        print(f"  ✗ {word}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""🗄️ 持久化查询缓存 (SQLite)
+
+按命名空间存 key -> JSON 值，每条带过期时间；进程重启、重新部署后依然有效。
+可以只清某个命名空间或某一条，不用像 st.cache_data.clear() 那样一次全清。
+过期的条目读的时候当作没有；启动时和之后每隔 purge_every 秒写入时顺手删掉，文件不会一直涨。
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import profiler
+
+
+class CacheStore:
+    def __init__(self, path, purge_every=600.0):
+        self.path = path
+        self.purge_every = purge_every
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires REAL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+        self.purge_expired()
+
+    def _conn(self):
+        # sqlite 连接不能跨线程用，每个线程各开一个
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        """返回 (是否命中, 值)"""
+        row = self._conn().execute(
+            "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        hit = row is not None and (row[1] is None or row[1] > time.time())
+        with self._lock:
+            counter = self._hits if hit else self._misses
+            counter[namespace] = counter.get(namespace, 0) + 1
+        return (True, json.loads(row[0])) if hit else (False, None)
+
+    def set(self, namespace, key, value, ttl=None):
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), expires),
+            )
+        if now >= self._next_purge:
+            self.purge_expired()
+
+    def invalidate(self, namespace, key=None):
+        with self._conn() as conn:
+            if key is None:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge_expired(self):
+        """删掉所有过期条目；返回删了多少条"""
+        now = time.time()
+        self._next_purge = now + self.purge_every
+        with self._conn() as conn:
+            deleted = conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)).rowcount
+        profiler.count("cache.purged", deleted)
+        return deleted
+
+    def cached(self, namespace, ttl=None, cache_if=None, negative_ttl=None):
+        """装饰器：按参数缓存函数结果；cache_if(value) 为假的结果不写缓存 (比如失败时的空字符串)
+
+        negative_ttl: 给了的话，失败的结果单独记在 "<namespace>.failed" 里，只保留这么多秒，
+        期间同样的参数直接返回失败值，不再去等一次超时；过期后自然重试，不会污染正常缓存。
+        函数抛出的异常 (比如熔断中) 什么都不记。
+        """
+        failed_ns = f"{namespace}.failed"
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args):
+                key = json.dumps(args, ensure_ascii=False)
+                hit, value = self.get(namespace, key)
+                if hit:
+                    profiler.count(f"cache.{namespace}.hit")
+                    return value
+                if negative_ttl:
+                    hit, value = self.get(failed_ns, key)
+                    if hit:
+                        profiler.count(f"cache.{failed_ns}.hit")
+                        return value
+                profiler.count(f"cache.{namespace}.miss")
+                value = fn(*args)
+                if cache_if is None or cache_if(value):
+                    self.set(namespace, key, value, ttl)
+                elif negative_ttl:
+                    self.set(failed_ns, key, value, negative_ttl)
+                return value
+            return wrapper
+        return decorator
+
+    def stats(self):
+        conn = self._conn()
+        counts = dict(conn.execute(
+            "SELECT namespace, COUNT(*) FROM entries WHERE expires IS NULL OR expires > ? GROUP BY namespace", (time.time(),)
+        ).fetchall())
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        with self._lock:
+            names = set(counts) | set(self._hits) | set(self._misses)
+            namespaces = {}
+            for name in sorted(names):
+                hits, misses = self._hits.get(name, 0), self._misses.get(name, 0)
+                namespaces[name] = {
+                    'entries': counts.get(name, 0),
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                }
+        return {'bytes': page_count * page_size, 'namespaces': namespaces}
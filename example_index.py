@@ -0,0 +1,284 @@
+"""📝 离线例句索引
+
+从 Tatoeba 风格的双语 TSV (法语, 译文) 流式读句子，建一个 词形 -> 句子 的倒排索引，
+存成一个目录里的几个 .npy 数组，打开时用 mmap 映射，不整个读进内存。
+加词时和批量补全 example 列时都从这里挑短而贴切的例句，不联网。
+
+    python example_index.py build fra-cmn.tsv [-o examples_fr]
+    python example_index.py lookup chat "pomme de terre"
+    python example_index.py backfill vocab.db        # 或 vocab.csv；只填 example 为空的行
+
+TSV 每行要么是 Tatoeba 句对导出的 4 列 (id, 法语, id, 译文)，要么就是 2 列 (法语, 译文)。
+句子按长度排好序再编号，所以每个词的句子列表天然是从短到长。
+"""
+import argparse
+import bz2
+import gzip
+import os
+import re
+import shutil
+import sys
+import time
+import unicodedata
+
+import numpy as np
+
+from vocab import ARTICLES
+
+DEFAULT_INDEX_PATH = "examples_fr"
+MAX_CHARS = 90       # 太长的句子不适合当例句，建索引时就丢掉
+MAX_POSTINGS = 64    # 每个词只记最短的这么多句
+MIN_WORDS = 3        # "Chat !" 这种太短的不要
+MAX_TERM_BYTES = 32  # 词形表是定长数组，比这还长的词形不收
+
+TOKEN_RE = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+ELISIONS = ("l'", "d'", "j'", "m'", "n'", "s'", "t'", "c'", "qu'", "jusqu'", "lorsqu'", "puisqu'")
+ARRAYS = ("sent_offsets", "sent_blob", "terms", "post_offsets", "postings")
+
+# 查询时的词形扩展 (没有词形还原器，只覆盖最常见的变化)：词尾 -> 可能的变形
+INFLECTIONS = (
+    ("er", ("e", "es", "ent", "ons", "ez", "é", "ée", "és", "ées", "ait", "ais", "era")),
+    ("ir", ("is", "it", "issons", "issez", "issent", "i", "ie")),
+    ("re", ("s", "", "ons", "ez", "ent", "u", "ue")),
+    ("al", ("aux", "ale", "ales")),
+    ("", ("s", "x", "e", "es")),
+)
+
+
+def fold(text):
+    """小写、去掉重音，’ 统一成 '"""
+    text = unicodedata.normalize('NFKD', text.casefold().replace("’", "'"))
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokens(text):
+    """句子 -> 词形列表：l'amour -> amour，qu'il -> il"""
+    out = []
+    for token in TOKEN_RE.findall(fold(text)):
+        if "'" in token:
+            head, rest = token.split("'", 1)
+            if head + "'" in ELISIONS:
+                token = rest
+        out.append(token)
+    return out
+
+
+def headword_tokens(word):
+    """词表里的词 (可能带冠词) -> 要查的词形"""
+    key = fold(word).strip()
+    for article in ARTICLES:
+        if key.startswith(fold(article)):
+            key = key[len(article):].strip()
+            break
+    return tokens(key)
+
+
+def forms(token):
+    """原形在前，然后是常见的屈折变化"""
+    yield token
+    for ending, variants in INFLECTIONS:
+        if token.endswith(ending) and len(token) > len(ending) + 1:
+            stem = token[:len(token) - len(ending)] if ending else token
+            for variant in variants:
+                form = fold(stem + variant)
+                if form != token:
+                    yield form
+
+
+def _open(path):
+    if path.endswith(".bz2"):
+        return bz2.open(path, 'rt', encoding='utf-8')
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_pairs(lines):
+    """逐行 yield (法语, 译文)；列数不对的行跳过"""
+    for line in lines:
+        cols = line.rstrip("\n").split("\t")
+        if len(cols) >= 4:
+            yield cols[1].strip(), cols[3].strip()
+        elif len(cols) >= 2:
+            yield cols[0].strip(), cols[1].strip()
+
+
+def build_index(tsv_path, index_path=DEFAULT_INDEX_PATH, max_chars=MAX_CHARS,
+                max_postings=MAX_POSTINGS, progress=None):
+    """返回 (读了多少行, 收了多少句, 多少个词形)；先写临时目录，写完再替换"""
+    pairs = {}
+    lines = 0
+    with _open(tsv_path) as f:
+        for fr, tr in iter_pairs(f):
+            lines += 1
+            if fr and len(fr) <= max_chars and fr not in pairs:
+                pairs[fr] = tr
+            if progress and lines % 100000 == 0:
+                progress(lines, len(pairs))
+
+    # 按长度编号：每个词的句子列表自然从短到长，截断时留下的就是最短的
+    sentences = sorted(pairs.items(), key=lambda pair: len(pair[0]))
+    postings = {}
+    for sid, (fr, _) in enumerate(sentences):
+        for token in set(tokens(fr)):
+            ids = postings.setdefault(token, [])
+            if len(ids) < max_postings:
+                ids.append(sid)
+
+    blobs = [f"{fr}\t{tr}".encode('utf-8') for fr, tr in sentences]
+    terms = sorted(term for term in postings if len(term.encode('utf-8')) <= MAX_TERM_BYTES)
+    arrays = {
+        'sent_offsets': _offsets(blobs),
+        'sent_blob': np.frombuffer(b"".join(blobs), dtype=np.uint8),
+        'terms': np.array([term.encode('utf-8') for term in terms], dtype=f"S{MAX_TERM_BYTES}"),
+        'post_offsets': _offsets([postings[term] for term in terms]),
+        'postings': np.fromiter((sid for term in terms for sid in postings[term]), dtype=np.uint32),
+    }
+
+    tmp_path = index_path.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    shutil.rmtree(index_path, ignore_errors=True)
+    os.replace(tmp_path, index_path)
+    return lines, len(sentences), len(terms)
+
+
+def _offsets(chunks):
+    offsets = np.zeros(len(chunks) + 1, dtype=np.uint64)
+    np.cumsum([len(chunk) for chunk in chunks], out=offsets[1:])
+    return offsets
+
+
+class ExampleIndex:
+    """只读；数组都是 mmap，多线程共享没问题"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+        self._sent_offsets = arrays['sent_offsets']
+        self._sent_blob = arrays['sent_blob']
+        self._post_offsets = arrays['post_offsets']
+        self._postings = arrays['postings']
+        self._terms = arrays['terms']  # 排好序的定长 bytes，searchsorted 直接在 mmap 上二分
+
+    def __len__(self):
+        return len(self._sent_offsets) - 1
+
+    def sentence(self, sid):
+        blob = self._sent_blob[self._sent_offsets[sid]:self._sent_offsets[sid + 1]].tobytes().decode('utf-8')
+        fr, _, tr = blob.partition("\t")
+        return fr, tr
+
+    def _ids(self, term):
+        key = term.encode('utf-8')
+        i = int(np.searchsorted(self._terms, key))
+        if i == len(self._terms) or self._terms[i] != key:
+            return self._postings[:0]
+        return self._postings[self._post_offsets[i]:self._post_offsets[i + 1]]
+
+    def lookup(self, word, limit=3, min_words=MIN_WORDS):
+        """返回最多 limit 个 (法语, 译文)，短的在前；原形的句子排在变形前面"""
+        wanted = headword_tokens(word)
+        if not wanted:
+            return []
+        found, seen = [], set()
+        if len(wanted) == 1:
+            for form in forms(wanted[0]):
+                for sid in self._ids(form):
+                    if len(found) >= limit:
+                        return found
+                    if sid in seen:
+                        continue
+                    seen.add(sid)
+                    fr, tr = self.sentence(int(sid))
+                    if fr.count(" ") + 1 >= min_words:
+                        found.append((fr, tr))
+            return found
+
+        # 多词短语：每个词允许变形 (pommes de terre)，从最稀有的那个词的句子里找连着出现的
+        variants = [set(forms(token)) for token in wanted]
+        candidates = min((np.unique(np.concatenate([self._ids(form) for form in group]))
+                          for group in variants), key=len)
+        width = len(wanted)
+        for sid in candidates:
+            fr, tr = self.sentence(int(sid))
+            folded = fold(fr)
+            if not all(any(form in folded for form in group) for group in variants):
+                continue  # 先按子串粗筛，省掉大多数分词
+            words = tokens(fr)
+            if any(all(words[i + k] in variants[k] for k in range(width))
+                   for i in range(len(words) - width + 1)):
+                found.append((fr, tr))
+                if len(found) >= limit:
+                    break
+        return found
+
+    def best(self, word):
+        """一个最合适的法语例句，没有就返回空字符串"""
+        found = self.lookup(word, limit=1)
+        return found[0][0] if found else ""
+
+
+def open_index(path=DEFAULT_INDEX_PATH):
+    """索引目录不存在就返回 None，example 留空"""
+    if not os.path.exists(os.path.join(path, "postings.npy")):
+        return None
+    return ExampleIndex(path)
+
+
+def backfill(words, examples, index):
+    """words / examples 是对齐的两列；返回 [(位置, 例句)]，只填原来为空的"""
+    updates = []
+    for i, (word, example) in enumerate(zip(words, examples)):
+        if not str(example or "").strip():
+            found = index.best(str(word))
+            if found:
+                updates.append((i, found))
+    return updates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline example-sentence index")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="build the index from a bilingual TSV(.gz/.bz2)")
+    p_build.add_argument("tsv")
+    p_build.add_argument("-o", "--output", default=DEFAULT_INDEX_PATH)
+    p_build.add_argument("--max-chars", type=int, default=MAX_CHARS)
+    p_lookup = sub.add_parser("lookup", help="show examples for words")
+    p_lookup.add_argument("words", nargs="+")
+    p_lookup.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+    p_fill = sub.add_parser("backfill", help="fill empty examples in a vocab.csv or vocab.db")
+    p_fill.add_argument("vocab")
+    p_fill.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        start = time.perf_counter()
+
+        def report(lines, kept):
+            rate = lines / (time.perf_counter() - start)
+            print(f"\r{lines} lines, {kept} sentences ({rate:.0f} lines/s)", end="", file=sys.stderr, flush=True)
+
+        lines, sentences, terms = build_index(args.tsv, args.output, max_chars=args.max_chars, progress=report)
+        print(file=sys.stderr)
+        print(f"{sentences} sentences, {terms} word forms from {lines} lines "
+              f"in {time.perf_counter() - start:.1f}s -> {args.output}")
+    elif args.cmd == "lookup":
+        index = ExampleIndex(args.index)
+        for word in args.words:
+            for fr, tr in index.lookup(word) or [("-", "")]:
+                print(f"{word}\t{fr}\t{tr}")
+    else:
+        from storage import open_path
+        index = ExampleIndex(args.index)
+        store = open_path(args.vocab)  # 新建的 .db 和 App 一样先导入 vocab.csv
+        df = store.load_frame()
+        updates = [(df.index[i], example) for i, example in backfill(df['word'], df['example'], index)]
+        store.set_examples(updates)
+        print(f"filled {len(updates)} examples in {args.vocab}")
+
+
+if __name__ == "__main__":
+    main()
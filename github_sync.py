@@ -0,0 +1,207 @@
+"""☁️ GitHub 同步：预写日志 + 防抖批量提交
+
+加词、打分都先追加到本地 WAL (一行一个 JSON 事件)，由后台线程在停手一段时间后
+(或事件攒够一定数量时) 合并成一次提交推到 GitHub，界面上的点击从不等 GitHub API。
+
+- 内容哈希和远端一致就不提交
+- 远端文件在这期间被改过 (SHA 冲突) 就按单词合并后重试，而不是直接失败
+- 进程挂掉时 WAL 里还没推上去的事件留在盘上；修改本身已经在本地库里，下次启动直接把当前表推上去，推成功才清掉
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import profiler
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_csv_text(text):
+    df = pd.read_csv(io.StringIO(text), encoding='utf-8', keep_default_na=False, quotechar='"')
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def merge_tables(local, remote):
+    """按 word 合并：两边都有的词取最近复习过的那行 (一样新就以本地为准)，只在远端的词追加在后面"""
+    if remote.empty:
+        return local
+    remote = remote.reindex(columns=local.columns)
+    remote_by_word = remote.drop_duplicates('word', keep='last').set_index('word')
+    merged = local.copy()
+
+    common = merged['word'].isin(remote_by_word.index)
+    if common.any():
+        local_last = merged.loc[common, 'last_review'].fillna("").astype(str)
+        remote_last = remote_by_word.loc[merged.loc[common, 'word'], 'last_review'].fillna("").astype(str)
+        newer = local_last.values < remote_last.values
+        if newer.any():
+            rows = merged.loc[common].index[newer]
+            merged.loc[rows] = remote_by_word.loc[merged.loc[rows, 'word']].reset_index()[merged.columns].values
+
+    remote_only = remote[~remote['word'].isin(merged['word'])]
+    return pd.concat([merged, remote_only], ignore_index=True)
+
+
+class SyncManager:
+    def __init__(self, connect, wal_path=".cache/sync_wal.jsonl", path="vocab.csv",
+                 debounce=30.0, max_events=100, retry_after=60.0, message="Update vocab via App"):
+        """connect: 无参函数，返回 PyGithub 的 Repository (或同接口的假对象)，只调用一次"""
+        self._connect = connect
+        self._repo = None
+        self.wal_path = wal_path
+        self.path = path
+        self.debounce = debounce
+        self.max_events = max_events
+        self.retry_after = retry_after
+        self.message = message
+        if os.path.dirname(wal_path):
+            os.makedirs(os.path.dirname(wal_path), exist_ok=True)
+
+        self._lock = threading.Lock()          # 保护 WAL 和状态
+        self._flush_lock = threading.Lock()    # 同一时间只跑一个 flush
+        self._timer = None
+        self._table = None
+        self._pending = len(self.pending_events())
+        self._last_hash = None
+
+        self.pushes = 0
+        self.skipped = 0
+        self.conflicts = 0
+        self.last_push = None
+        self.last_error = None
+
+    # --- 写入 ---
+    def record(self, kind, rows, table):
+        """追加事件并把 table 记为最新状态，然后 (重新) 计时；不会阻塞
+
+        table 可以是 DataFrame，也可以是返回 DataFrame 拷贝的函数 (推送时才调用)
+        """
+        with self._lock, profiler.span("sync.record"):
+            with open(self.wal_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({'ts': time.time(), 'kind': kind, 'row': _jsonable(row)}, ensure_ascii=False) + "\n")
+            self._pending += len(rows)
+            self._table = table
+            delay = 0.0 if self._pending >= self.max_events else self.debounce
+        self._schedule(delay)
+
+    def flush_soon(self, table=None):
+        """不等防抖，立刻在后台推一次 (比如一轮复习结束、手动点同步)"""
+        if table is not None:
+            with self._lock:
+                self._table = table
+        self._schedule(0.0)
+
+    def pending_events(self):
+        if not os.path.exists(self.wal_path):
+            return []
+        with open(self.wal_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def status(self):
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'pushes': self.pushes,
+                'skipped': self.skipped,
+                'conflicts': self.conflicts,
+                'last_push': self.last_push,
+                'last_error': self.last_error,
+            }
+
+    # --- 后台 ---
+    def _schedule(self, delay):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """把当前表推到 GitHub；成功后把已经包含进去的 WAL 事件删掉"""
+        with self._flush_lock:
+            with self._lock:
+                table = self._table
+                covered = self._pending
+            if table is None:
+                return
+            try:
+                with profiler.span("sync.push"):  # 在后台线程里，只进全局汇总
+                    self._push(table() if callable(table) else table.copy())
+            except Exception as e:
+                with self._lock:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                self._schedule(self.retry_after)
+                return
+            with self._lock:
+                self.last_error = None
+                self._truncate_wal(covered)
+
+    def _push(self, table):
+        local_csv = table.to_csv(index=False, encoding='utf-8')
+        local_hash = content_hash(local_csv)
+        if local_hash == self._last_hash:
+            with self._lock:
+                self.skipped += 1
+            profiler.count("sync.skipped")
+            return
+
+        if self._repo is None:
+            self._repo = self._connect()  # 整个进程复用同一个已认证的客户端
+        for _ in range(3):
+            contents = self._repo.get_contents(self.path)
+            remote_csv = contents.decoded_content.decode('utf-8')
+            merged_csv = merge_tables(table, read_csv_text(remote_csv)).to_csv(index=False, encoding='utf-8')
+            if content_hash(merged_csv) == content_hash(remote_csv):
+                with self._lock:
+                    self.skipped += 1
+                profiler.count("sync.skipped")
+                self._last_hash = local_hash
+                return
+            try:
+                self._repo.update_file(contents.path, self.message, merged_csv, contents.sha)
+            except Exception as e:
+                if getattr(e, 'status', None) != 409:
+                    raise
+                # 别人刚改过远端文件：重新拉一次再合并
+                with self._lock:
+                    self.conflicts += 1
+                profiler.count("sync.conflict")
+                continue
+            with self._lock:
+                self.pushes += 1
+                self.last_push = time.time()
+            profiler.count("net.github.push")
+            self._last_hash = local_hash
+            return
+        raise RuntimeError("gave up after repeated SHA conflicts")
+
+    def _truncate_wal(self, covered):
+        events = self.pending_events()[covered:]
+        tmp = self.wal_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.wal_path)
+        self._pending = len(events)
+
+
+def _jsonable(row):
+    out = {}
+    for col, value in dict(row).items():
+        if value is None or (isinstance(value, float) and value != value):
+            out[col] = None
+        elif hasattr(value, 'item'):
+            out[col] = value.item()  # numpy 标量
+        else:
+            out[col] = value
+    return out
@@ -0,0 +1,52 @@
+"""💤 可选的第三方库按需加载
+
+gtts、deep_translator、github、bs4、requests 加起来要 import 好几百毫秒，
+但只开复习模式、没配同步的时候一个都用不上。模块顶上写
+
+    requests = lazy("requests")
+
+拿到的是一个占位对象，第一次访问它的属性时才真正 import；之后和原模块一样用。
+LOAD_TIMES 记着每个库实际 import 花了多久，启动基准会用到。
+"""
+import importlib
+import threading
+import time
+
+LOAD_TIMES = {}  # 模块名 -> 第一次用到时 import 花的秒数
+_lock = threading.Lock()
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    LOAD_TIMES[self._name] = time.perf_counter() - start
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy(name):
+    return LazyModule(name)
@@ -0,0 +1,216 @@
+"""🔎 词典查询：中文翻译 + Wiktionary 词性/阴阳性
+
+两个来源在线程池里同时发出，按完成顺序返回结果，页面可以先显示翻译、再补上词性。
+Wiktionary 走一个带连接池的共享 requests.Session。
+每个外部服务前面有一个熔断器 (breaker.py)：服务挂了就立刻失败，后台探测恢复。
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+
+import profiler
+from breaker import CircuitBreaker, CircuitOpen
+from lazy import lazy
+
+# 网络相关的库第一次查词时才 import
+bs4 = lazy("bs4")
+deep_translator = lazy("deep_translator")
+requests = lazy("requests")
+
+WIKTIONARY_URL = "https://fr.wiktionary.org/wiki/{}"
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+
+
+@dataclass
+class LookupConfig:
+    # 单次请求超时 (秒) 和失败后的重试次数，按来源分别配置
+    timeouts: dict = field(default_factory=lambda: {'translation': 5.0, 'gender': 5.0})
+    retries: dict = field(default_factory=lambda: {'translation': 1, 'gender': 1})
+    backoff: float = 0.3
+
+    def budget(self, name):
+        """一个来源最多能占用的总时间：每次尝试的超时 + 重试间隔"""
+        retries = self.retries.get(name, 0)
+        return self.timeouts.get(name, 5.0) * (retries + 1) + self.backoff * retries
+
+
+# --- HTTP 连接池 ---
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session(pool_size=8):
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def call_with_retries(fn, *args, retries=1, backoff=0.3, **kwargs):
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except CircuitOpen:
+            raise  # 熔断中，重试也是白等
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (attempt + 1))
+
+
+# --- 熔断器 ---
+def _translate(text):
+    return deep_translator.GoogleTranslator(source='fr', target='zh-CN').translate(text)
+
+
+def _get_page(url, timeout=5, session=None):
+    response = (session or http_session()).get(url, timeout=timeout)
+    if response.status_code != 404:
+        response.raise_for_status()  # 5xx / 429 才算服务出问题，404 只是没有这个词
+    return response
+
+
+def _probe_wiktionary():
+    _get_page(WIKTIONARY_URL.format("bonjour"), timeout=3)
+
+
+# 整个进程共用 (页面、批量导入都经过这里)；探针用一个肯定存在的词
+BREAKERS = {
+    'translation': CircuitBreaker("translation", probe=lambda: _translate("bonjour")),
+    'wiktionary': CircuitBreaker("wiktionary", probe=_probe_wiktionary),
+}
+
+
+def degraded():
+    """现在熔断中的服务名"""
+    return [name for name, breaker in BREAKERS.items() if breaker.state != "closed"]
+
+
+# --- 数据源 ---
+def fetch_translation(text, timeout=None):
+    # deep_translator 不接受 timeout，超时由 LookupEngine 的截止时间兜底 (并记为熔断器的失败)
+    profiler.count("net.translation")
+    with profiler.span("net.translation"):
+        return BREAKERS['translation'].call(_translate, text)
+
+
+def fetch_wiktionary_pos(word, timeout=5, session=None, index=None):
+    word = word.strip().lower()
+    if index is not None:
+        # 离线索引命中就不联网 (见 wiktionary_index.py)
+        pos = index.lookup(word)
+        if pos:
+            profiler.count("index.wiktionary.hit")
+            return pos
+    profiler.count("net.wiktionary")
+    with profiler.span("net.wiktionary"):
+        response = BREAKERS['wiktionary'].call(_get_page, WIKTIONARY_URL.format(word), timeout, session)
+    if response.status_code == 404:
+        return "Unkown"
+    return parse_wiktionary_pos(response.content)
+
+
+def parse_wiktionary_pos(html):
+    pos = "Unkown"
+    soup = bs4.BeautifulSoup(html, 'html.parser')
+    fr_section = soup.find(id="Français")
+    if fr_section:
+        parent = fr_section.find_parent()
+        gender_line = parent.find_next('span', class_='ligne-de-forme')
+        if gender_line:
+            text = gender_line.get_text().lower()
+            if 'masculin' in text or ' m' in text: pos = "m. (masc)"
+            elif 'féminin' in text or ' f' in text: pos = "f. (fem)"
+
+        if pos == "Unkown":
+            all_pos_headers = soup.find_all('span', class_='titredef')
+            for header in all_pos_headers:
+                if 'nom' in header.get_text().lower():
+                    next_line = header.find_next('p')
+                    if next_line:
+                        txt = next_line.get_text().lower()
+                        if 'masculin' in txt:
+                            pos = "m. (masc)"
+                            break
+                        elif 'féminin' in txt:
+                            pos = "f. (fem)"
+                            break
+                    pos = "n. (noun)"
+                elif 'verbe' in header.get_text().lower():
+                    pos = "v. (verb)"
+                    break
+                elif 'adjectif' in header.get_text().lower():
+                    pos = "adj."
+                    break
+    return pos
+
+
+# --- 并发查询 ---
+class LookupEngine:
+    def __init__(self, sources, config=None, max_workers=4, history=200, breakers=None):
+        """sources: {名字: (函数, 失败时的默认值)}，函数签名为 fn(query)
+
+        breakers: {来源名: CircuitBreaker}；过了截止时间还没返回的来源算这个熔断器的一次失败。
+        卡死不返回的请求 (比如 deep_translator 不设超时) 不会抛异常，不这样记的话永远不会跳闸
+        """
+        self.sources = sources
+        self.config = config or LookupConfig()
+        self.breakers = breakers or {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lookup")
+        self._timings = {name: deque(maxlen=history) for name in sources}
+        self._lock = threading.Lock()
+
+    def lookup(self, query):
+        """按完成先后 yield (来源, 结果, 耗时秒)；超出预算的来源返回默认值"""
+        start = time.perf_counter()
+        futures = {}
+        for name, (fn, _) in self.sources.items():
+            call = profiler.run_in_context(fn)  # 工作线程里的计时也算进这次 rerun
+            futures[self._pool.submit(call, query)] = name
+
+        deadline = max(self.config.budget(name) for name in self.sources)
+        pending = dict(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                name = pending.pop(future)
+                try:
+                    value = future.result()
+                except Exception:
+                    value = self.sources[name][1]
+                yield name, value, self._record(name, start)
+        except FutureTimeout:
+            for future, name in pending.items():
+                future.cancel()
+                if name in self.breakers:
+                    profiler.count(f"lookup.{name}.timeout")
+                    self.breakers[name].record_failure(TimeoutError(f"no answer after {deadline:.1f}s"))
+                yield name, self.sources[name][1], self._record(name, start)
+
+    def timings(self):
+        """每个来源最近若干次查询的耗时统计 (毫秒)"""
+        with self._lock:
+            out = {}
+            for name, samples in self._timings.items():
+                if samples:
+                    ordered = sorted(samples)
+                    out[name] = {
+                        'last_ms': samples[-1] * 1000,
+                        'p50_ms': ordered[len(ordered) // 2] * 1000,
+                        'p95_ms': ordered[int(len(ordered) * 0.95)] * 1000,
+                    }
+            return out
+
+    def _record(self, name, start):
+        elapsed = time.perf_counter() - start
+        profiler.record(f"lookup.{name}", elapsed)
+        with self._lock:
+            self._timings[name].append(elapsed)
+        return elapsed
@@ -0,0 +1,165 @@
+"""🐞 每次 rerun 的耗时剖析
+
+    with span("lookup.translation"):
+        ...
+    count("cache.translation.hit")
+
+- 每次整页 rerun 或卡片重画算一个 "run"：begin_run() 开始、end_run() 结束，
+  期间 (包括 copy_context 带过去的工作线程里) 的 span 和计数都记在这个 run 上
+- 结束的 run 放进环形缓冲区 RUNS，侧边栏调试面板展示，也可以导出成 JSON lines
+- 不在任何 run 里的 span (后台预渲染、GitHub 推送) 只进全局汇总 TOTALS
+
+默认关闭：关着的时候 span() 直接返回一个共享的空上下文，count() 第一行就返回，
+开销就是一次函数调用。环境变量 VOCAB_PROFILE=1 或调试面板里的开关可以打开。
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+RUNS_KEEP = 200
+
+enabled = os.environ.get("VOCAB_PROFILE", "") not in ("", "0")
+
+RUNS = deque(maxlen=RUNS_KEEP)  # 最近结束的 run，所有会话共用
+TOTALS = {}    # span 名 -> [次数, 总秒数, 最长秒数]
+COUNTERS = {}  # 计数器名 -> 次数
+_lock = threading.Lock()
+_current = contextvars.ContextVar("profiler_run", default=None)
+
+
+class _Noop:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def span(name):
+    """计时上下文；关闭时几乎零开销"""
+    if not enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name):
+    """装饰器版的 span"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds):
+    """记一段已经量好的耗时 (比如查词引擎自己测的每个来源)"""
+    if not enabled:
+        return
+    run = _current.get()
+    if run is not None:
+        run['spans'].setdefault(name, []).append(seconds * 1000)
+    with _lock:
+        total = TOTALS.setdefault(name, [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += seconds
+        total[2] = max(total[2], seconds)
+
+
+def count(name, n=1):
+    if not enabled:
+        return
+    run = _current.get()
+    if run is not None:
+        run['counters'][name] = run['counters'].get(name, 0) + n
+    with _lock:
+        COUNTERS[name] = COUNTERS.get(name, 0) + n
+
+
+def begin_run(kind, session=None, resume=False):
+    """kind: "page" 整页 rerun / "card" fragment 重画 / "click" 按钮回调
+
+    resume=True 时如果已经有一个没结束的 run (按钮回调开的)，就接着用它、只改 kind，
+    这样回调里的打分、同步也算在这次交互里
+    """
+    if not enabled:
+        return
+    run = _current.get()
+    if resume and run is not None:
+        run['kind'] = kind
+        return
+    _current.set({'ts': time.time(), 'kind': kind, 'session': session,
+                  'start': time.perf_counter(), 'spans': {}, 'counters': {}})
+
+
+def end_run():
+    run = _current.get()
+    if run is None:
+        return
+    _current.set(None)
+    run['total_ms'] = (time.perf_counter() - run.pop('start')) * 1000
+    RUNS.append(run)
+
+
+def run_in_context(fn):
+    """把当前 run 带进工作线程：pool.submit(run_in_context(fn), ...)"""
+    run = _current.get() if enabled else None
+    if run is None:
+        return fn
+
+    @functools.wraps(fn)
+    def call(*args, **kwargs):
+        token = _current.set(run)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return call
+
+
+def summary():
+    """TOTALS 整理成 [(名字, 次数, 平均 ms, 最长 ms)]，按总耗时排序"""
+    with _lock:
+        rows = [(name, n, total / n * 1000, longest * 1000) for name, (n, total, longest) in TOTALS.items()]
+    return sorted(rows, key=lambda row: -row[1] * row[2])
+
+
+def export_jsonl(runs=None):
+    return "".join(json.dumps(run, ensure_ascii=False) + "\n" for run in list(RUNS if runs is None else runs))
+
+
+def reset():
+    with _lock:
+        RUNS.clear()
+        TOTALS.clear()
+        COUNTERS.clear()
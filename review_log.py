@@ -0,0 +1,212 @@
+"""📊 复习历史：每次打分追加一条定长二进制记录，统计时 mmap 成 NumPy 列
+
+    python review_log.py stats [--log .cache/review_log.bin] [--days 30]
+
+update_progress 只留每个词最新的间隔，以前的打分就没了；这里把每一次打分都留下来，
+用来算记忆保持率、每个词忘了几次、每天复习多少，以后调倍率也有依据。
+
+文件 = 16 字节头 (magic, 版本, 每条记录的字节数) + 一条挨一条的 RECORD，只追加不改。
+进程崩溃最多丢掉缓冲里还没写的那一批；写了一半的尾巴读的时候直接忽略。
+"""
+import argparse
+import atexit
+import os
+import struct
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import profiler
+
+DEFAULT_LOG_PATH = ".cache/review_log.bin"
+MAGIC = b"VOCABLOG"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+
+# 紧凑排列，不对齐：25 字节一条，一百万次复习 25 MB
+RECORD = np.dtype([
+    ('day', '<i4'),            # 复习那天，1970-01-01 起的天数
+    ('id', '<i8'),             # 词表里的行 id
+    ('quality', 'i1'),         # 0 = 答错，1 = 答对
+    ('elapsed', '<i4'),        # 距上次复习多少天；第一次复习是 -1
+    ('prev_interval', '<i4'),  # 打分前的间隔
+    ('interval', '<i4'),       # 打分后的间隔
+])
+
+
+def _day(value):
+    """ISO 日期 / date -> 天数；空值返回 None"""
+    if value is None or pd.isna(value) or value == "":
+        return None
+    try:
+        return int(np.datetime64(value, 'D').astype(np.int64))
+    except ValueError:
+        return None
+
+
+class ReviewLog:
+    """进程级的追加写入器：攒够 batch 条或者停手 flush_after 秒后一次写盘"""
+
+    def __init__(self, path=DEFAULT_LOG_PATH, batch=32, flush_after=10.0):
+        self.path = os.path.abspath(path)  # 退出时 flush 可能已经换了工作目录
+        self.batch = batch
+        self.flush_after = flush_after
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _check_header(self.path)
+        self._lock = threading.Lock()          # 保护缓冲
+        self._write_lock = threading.Lock()    # 同一时间只有一个 flush 在写文件
+        self._buffer = []
+        self._timer = None
+        self.flushes = 0
+        atexit.register(self.flush)
+
+    def __len__(self):
+        with self._lock:
+            return _record_count(self.path) + len(self._buffer)
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def append(self, row_id, quality, last_review, prev_interval, interval, today=None):
+        """记一次打分；last_review 是打分前的上次复习日期 (新词为空)"""
+        day = _day(today or date.today())
+        last = _day(last_review)
+        record = (day, int(row_id), int(quality), day - last if last is not None else -1,
+                  int(prev_interval), int(interval))
+        with self._lock:
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.batch
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_after, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """把缓冲整批写到文件尾；返回写了多少条"""
+        with self._write_lock:
+            with self._lock:
+                records, self._buffer = self._buffer, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not records:
+                return 0
+            if os.path.exists(self.path):
+                size = os.path.getsize(self.path)
+                aligned = HEADER.size + _record_count(self.path) * RECORD.itemsize
+                if HEADER.size < size != aligned:
+                    os.truncate(self.path, aligned)  # 上次写了一半就崩了：先切掉尾巴，不然后面全错位
+            with profiler.span("review_log.flush"), open(self.path, 'ab') as f:
+                if f.tell() == 0:
+                    f.write(HEADER.pack(MAGIC, VERSION, RECORD.itemsize))
+                f.write(np.array(records, dtype=RECORD).tobytes())
+            self.flushes += 1
+            return len(records)
+
+
+def _check_header(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f:
+        magic, version, size = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or size != RECORD.itemsize:
+        raise ValueError(f"{path}: not a review log (or written by another version)")
+
+
+def _record_count(path):
+    if not os.path.exists(path):
+        return 0
+    return max(os.path.getsize(path) - HEADER.size, 0) // RECORD.itemsize
+
+
+def read_log(path=DEFAULT_LOG_PATH):
+    """整个日志映射成只读的结构化数组；取某一列 (log['day']) 才真正读那部分数据"""
+    n = _record_count(path)
+    if n == 0:
+        return np.zeros(0, dtype=RECORD)
+    _check_header(path)
+    return np.memmap(path, dtype=RECORD, mode='r', offset=HEADER.size, shape=(n,))
+
+
+# --- 📈 统计：全是整列的 NumPy 运算，不会把记录变成 Python 对象 ---
+def retention(log, max_days=60):
+    """按距上次复习的天数分桶：每桶多少次复习、答对的比例 (第一次见的新词不算)"""
+    seen = log['elapsed'] >= 0
+    buckets = np.minimum(log['elapsed'][seen], max_days)
+    reviews = np.bincount(buckets, minlength=max_days + 1)
+    recalled = np.bincount(buckets, weights=log['quality'][seen] > 0, minlength=max_days + 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = recalled / reviews
+    return pd.DataFrame({'reviews': reviews, 'retention': rate}, index=pd.RangeIndex(max_days + 1, name='days'))
+
+
+def lapses(log):
+    """每个词的复习次数和遗忘次数 (答错且之前已经背过)，忘得多的在前"""
+    # id 是词表的行号，直接当 bincount 的下标，不用先排序去重
+    ids = log['id']
+    reviews = np.bincount(ids)
+    forgot = np.bincount(ids, weights=(log['quality'] == 0) & (log['prev_interval'] > 0), minlength=len(reviews))
+    seen = np.flatnonzero(reviews)
+    out = pd.DataFrame({
+        'reviews': reviews[seen],
+        'lapses': forgot[seen].astype(np.int64),
+    }, index=pd.Index(seen, name='id'))
+    return out.sort_values(['lapses', 'reviews'], ascending=False, kind='stable')
+
+
+def daily(log):
+    """每天复习了多少、答对多少、其中多少是第一次见的新词"""
+    if not len(log):
+        return pd.DataFrame({'reviews': [], 'correct': [], 'new': []}, dtype=np.int64)
+    day = log['day']
+    first = day.min()
+    offset = day - first
+    reviews = np.bincount(offset)
+    active = np.flatnonzero(reviews)
+    return pd.DataFrame({
+        'reviews': reviews[active],
+        'correct': np.bincount(offset, weights=log['quality'] > 0)[active].astype(np.int64),
+        'new': np.bincount(offset, weights=log['elapsed'] < 0)[active].astype(np.int64),
+    }, index=pd.Index((active + first).astype('datetime64[D]'), name='day'))
+
+
+def summary(log):
+    seen = log['elapsed'] >= 0
+    return {
+        'reviews': len(log),
+        'words': int(np.count_nonzero(np.bincount(log['id']))) if len(log) else 0,
+        'retention': float((log['quality'][seen] > 0).mean()) if seen.any() else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Review history statistics")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_stats = sub.add_parser("stats")
+    p_stats.add_argument("--log", default=DEFAULT_LOG_PATH)
+    p_stats.add_argument("--days", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    log = read_log(args.log)
+    if not len(log):
+        print(f"{args.log}: no reviews yet")
+        return
+    info = summary(log)
+    retained = f"{info['retention']:.0%}" if info['retention'] is not None else "-"
+    print(f"{info['reviews']} reviews of {info['words']} words, retention {retained}")
+    print("\nretention by days since last review")
+    print(retention(log, args.days).query("reviews > 0").to_string())
+    print("\nreviews per day")
+    print(daily(log).tail(args.days).to_string())
+    print("\nmost lapses")
+    print(lapses(log).head(10).to_string())
+
+
+if __name__ == "__main__":
+    main()
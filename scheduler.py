@@ -0,0 +1,100 @@
+"""📅 到期卡片调度器
+
+所有卡片按 (next_review, interval, id, seq) 放在两个最小堆里：新词 (interval == 0) 一个，复习卡一个。
+堆顶就是最早到期的卡 —— 拖得越久越靠前，同一天到期的间隔短 (更容易忘) 的优先。
+
+- 组一轮复习只从堆顶弹出 k 张再放回去：O(k log n)，不扫整张表
+- 打分改了 next_review 就 reschedule()，往堆里推一个新条目，旧条目留着等弹到时丢掉 (惰性删除)；
+  每个条目带一个递增的 seq，卡片被调回以前用过的 (next_review, interval) 时，旧条目也不会被当成有效的
+- 新词和复习卡分开取，每轮新词有上限
+"""
+import heapq
+import itertools
+import random
+import threading
+
+
+class Scheduler:
+    def __init__(self, cards=()):
+        """cards: (id, next_review, interval) 的序列；next_review 是 ISO 日期字符串"""
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._current = {}  # id -> 现在有效的堆条目
+        self._new = []
+        self._review = []
+        for row_id, next_review, interval in cards:
+            entry = (next_review, int(interval), row_id, next(self._seq))
+            self._current[row_id] = entry
+            (self._new if entry[1] == 0 else self._review).append(entry)
+        heapq.heapify(self._new)
+        heapq.heapify(self._review)
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(zip(df.index.tolist(), df['next_review'].tolist(), df['interval'].tolist()))
+
+    def __len__(self):
+        return len(self._current)
+
+    # --- 写 ---
+    def reschedule(self, row_id, next_review, interval):
+        """新卡或打过分的卡：O(log n)"""
+        with self._lock:
+            current = self._current.get(row_id)
+            if current is not None and current[:3] == (next_review, int(interval), row_id):
+                return
+            entry = (next_review, int(interval), row_id, next(self._seq))
+            self._current[row_id] = entry
+            heapq.heappush(self._new if entry[1] == 0 else self._review, entry)
+            self._maybe_compact()
+
+    add = reschedule
+
+    def remove(self, row_id):
+        with self._lock:
+            self._current.pop(row_id, None)
+
+    # --- 读 ---
+    def session(self, today, size=50, new_limit=20, shuffle=True):
+        """一轮复习：最多 new_limit 个新词，剩下的名额给最早到期的复习卡
+
+        返回 id 列表；shuffle=False 时按到期先后排
+        """
+        with self._lock:
+            new = self._peek_due(self._new, today, min(size, new_limit))
+            review = self._peek_due(self._review, today, size - len(new))
+        ids = review + new
+        if shuffle:
+            random.shuffle(ids)
+        return ids
+
+    def due_count(self, today):
+        """今天到期的卡数 (新词, 复习卡)；要逐个看，O(n)，只用于统计"""
+        with self._lock:
+            due = [entry for entry in self._current.values() if entry[0] <= today]
+        new = sum(1 for entry in due if entry[1] == 0)
+        return new, len(due) - new
+
+    # --- 内部 ---
+    def _peek_due(self, heap, today, k):
+        """弹出最多 k 个已到期的有效条目再推回去，堆保持不变"""
+        taken = []
+        ids = []
+        while heap and len(ids) < k and heap[0][0] <= today:
+            entry = heapq.heappop(heap)
+            if self._current.get(entry[2]) != entry:
+                continue  # 已经被重新调度或删掉的旧条目，顺手丢掉
+            taken.append(entry)
+            ids.append(entry[2])
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return ids
+
+    def _maybe_compact(self):
+        # 旧条目攒到有效条目的两倍时重建一次，内存不会无限涨
+        if len(self._new) + len(self._review) > 2 * len(self._current) + 64:
+            live = self._current.values()
+            self._new = [entry for entry in live if entry[1] == 0]
+            self._review = [entry for entry in live if entry[1] != 0]
+            heapq.heapify(self._new)
+            heapq.heapify(self._review)
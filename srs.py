@@ -0,0 +1,80 @@
+"""📈 间隔重复的批量计算 (NumPy 向量化)
+
+整副牌的 interval / next_review 转成定长数组 (int32 和 datetime64[D]) 一次算完：
+- next_intervals: 打分后的新间隔 (原来的 "答错 1 天，答对 ×2.2" 规则)
+- forecast: 未来 N 天每天有多少张到期
+- spread_overdue: 把积压的到期卡均摊到接下来几天
+- rescale: 换了倍率以后，按新倍率重算还没到期的卡
+
+日期都是从今天算起的天数差，不碰 Python 的 date 对象；10 万张卡片也是几毫秒的事。
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+MULTIPLIER = 2.2
+
+
+def to_days(dates):
+    """ISO 日期字符串 (可以有空值) -> datetime64[D] 数组；空值变 NaT"""
+    return pd.to_datetime(pd.Series(dates, dtype=object), format='%Y-%m-%d', errors='coerce').values.astype('datetime64[D]')
+
+
+def to_iso(days):
+    """datetime64[D] 数组 -> ISO 字符串列表"""
+    return np.datetime_as_string(np.asarray(days, dtype='datetime64[D]'), unit='D').tolist()
+
+
+def next_intervals(intervals, qualities, multiplier=MULTIPLIER):
+    """quality 0 = 答错 -> 1 天；1 = 答对 -> 新卡 1 天，否则 interval × multiplier (向下取整)"""
+    intervals = np.asarray(intervals, dtype=np.int32)
+    qualities = np.asarray(qualities)
+    grown = np.where(intervals == 0, 1, (intervals * multiplier).astype(np.int32))
+    return np.where(qualities == 0, 1, grown).astype(np.int32)
+
+
+def review(intervals, qualities, today=None, multiplier=MULTIPLIER):
+    """打分：返回 (新间隔, 下次复习日期)"""
+    today = np.datetime64(today or date.today(), 'D')
+    new = next_intervals(intervals, qualities, multiplier)
+    return new, today + new.astype('timedelta64[D]')
+
+
+def forecast(due, today=None, days=365):
+    """未来 days 天每天到期的卡数；已经过期的都算在今天 (第 0 天)"""
+    today = np.datetime64(today or date.today(), 'D')
+    due = np.asarray(due, dtype='datetime64[D]')
+    offset = (due[~np.isnat(due)] - today).astype(np.int64)
+    offset = np.clip(offset, 0, None)
+    return np.bincount(offset[offset < days], minlength=days)
+
+
+def spread_overdue(due, today=None, days=7):
+    """把 next_review 早于今天的卡按拖欠程度排好，均摊到从今天起的 days 天里
+
+    拖得最久的排最前面；返回新的 due 数组 (没过期的原样保留) 和被挪动的位置
+    """
+    today = np.datetime64(today or date.today(), 'D')
+    due = np.asarray(due, dtype='datetime64[D]').copy()
+    overdue = np.flatnonzero(due < today)
+    if not len(overdue):
+        return due, overdue
+    order = overdue[np.argsort(due[overdue], kind='stable')]
+    per_day = -(-len(order) // days)  # 向上取整
+    due[order] = today + (np.arange(len(order)) // per_day).astype('timedelta64[D]')
+    return due, order
+
+
+def rescale(intervals, last_review, old=MULTIPLIER, new=MULTIPLIER, today=None):
+    """倍率从 old 换成 new：复习过的卡间隔按比例缩放，下次复习日 = 上次复习 + 新间隔 (最早今天)
+
+    新卡 (interval 0 或没有 last_review) 不动；返回 (新间隔, 新 due, 被改动的位置)
+    """
+    today = np.datetime64(today or date.today(), 'D')
+    intervals = np.asarray(intervals, dtype=np.int32)
+    last_review = np.asarray(last_review, dtype='datetime64[D]')
+    changed = np.flatnonzero((intervals > 0) & ~np.isnat(last_review))
+    scaled = np.maximum(1, np.rint(intervals[changed] * (new / old))).astype(np.int32)
+    due = np.maximum(last_review[changed] + scaled.astype('timedelta64[D]'), today)
+    return scaled, due, changed
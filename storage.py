@@ -0,0 +1,281 @@
+"""💾 词表存储
+
+默认用内嵌 SQLite (vocab.db)：word 和 next_review 有索引，日期/间隔是有类型的列，
+每次打分只 UPDATE 一行。CSV 仍然是导入/导出 (和 GitHub 同步) 的格式，也保留成一个可选后端。
+
+    python storage.py migrate vocab.csv vocab.db   # 旧的 vocab.csv 迁移进 SQLite
+    python storage.py export vocab.db vocab.csv
+"""
+import argparse
+import io
+import json
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+
+from vocab import REQUIRED_COLS, SRS_COLS
+
+COLUMNS = REQUIRED_COLS + SRS_COLS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id          INTEGER PRIMARY KEY,
+    word        TEXT NOT NULL,
+    meaning     TEXT NOT NULL DEFAULT '',
+    gender      TEXT NOT NULL DEFAULT '',
+    example     TEXT NOT NULL DEFAULT '',
+    last_review DATE,
+    next_review DATE NOT NULL,
+    interval    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS words_word ON words (word COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS words_next_review ON words (next_review);
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def read_vocab_csv(source):
+    """读 CSV (路径或文本流) 并把列整理成统一格式；日期只在这里解析一次"""
+    df = pd.read_csv(source, encoding='utf-8', keep_default_na=False, quotechar='"')
+    df.columns = df.columns.str.strip()
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = None if col == 'last_review' else ("" if col in REQUIRED_COLS else 0)
+    df['next_review'] = pd.to_datetime(df['next_review'], errors='coerce').dt.strftime('%Y-%m-%d')
+    df['next_review'] = df['next_review'].fillna(date.today().isoformat())
+    df['last_review'] = df['last_review'].replace("", None)
+    df['interval'] = pd.to_numeric(df['interval'], errors='coerce').fillna(0).astype(int)
+    return df[COLUMNS]
+
+
+class SQLiteStore:
+    def __init__(self, path="vocab.db"):
+        self.path = path
+        # Streamlit 每个会话跑在不同线程，共用一个连接，写操作串行
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def load_frame(self):
+        """整张表读成 DataFrame，行索引就是 id"""
+        with self._lock:
+            df = pd.read_sql_query(f"SELECT id, {', '.join(COLUMNS)} FROM words ORDER BY id", self._conn, index_col='id')
+        df.index.name = None
+        return df
+
+    def due_ids(self, today, limit=None):
+        """next_review <= today 的 id，走 next_review 索引"""
+        sql = "SELECT id FROM words WHERE next_review <= ? ORDER BY next_review"
+        params = [today]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def find(self, word):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT id FROM words WHERE word = ? COLLATE NOCASE", (word,))]
+
+    def add(self, row):
+        return self.add_many([row])[0]
+
+    def add_many(self, rows):
+        ids = []
+        with self._lock, self._conn:
+            for row in rows:
+                cur = self._conn.execute(
+                    f"INSERT INTO words ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [row.get(col) for col in COLUMNS],
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def update_progress(self, row_id, last_review, next_review, interval):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE words SET last_review = ?, next_review = ?, interval = ? WHERE id = ?",
+                (last_review, next_review, int(interval), int(row_id)),
+            )
+
+    def reschedule_many(self, updates):
+        """批量改 (id, next_review, interval)，一个事务"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE words SET next_review = ?, interval = ? WHERE id = ?",
+                [(next_review, int(interval), int(row_id)) for row_id, next_review, interval in updates],
+            )
+
+    def set_examples(self, updates):
+        """批量填 (id, example)，一个事务"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE words SET example = ? WHERE id = ?",
+                [(example, int(row_id)) for row_id, example in updates],
+            )
+
+    def load_settings(self):
+        """和词表存在一起的调度设置 (比如间隔倍率)，值是 JSON"""
+        with self._lock:
+            return {key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM settings")}
+
+    def set_setting(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def import_csv(self, source):
+        df = read_vocab_csv(source)
+        rows = df.astype(object).where(df.notna(), None).to_dict('records')
+        return self.add_many(rows)
+
+    def export_csv(self, path=None):
+        text = self.load_frame().to_csv(index=False, encoding='utf-8')
+        if path is None:
+            return text
+        with io.open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+
+class CSVStore:
+    """旧的存储方式：整张表放内存，save() 时整个文件重写；设置放在旁边的 .settings.json"""
+
+    def __init__(self, path="vocab.csv"):
+        self.path = path
+        self.settings_path = os.path.splitext(path)[0] + ".settings.json"
+        try:
+            self._df = read_vocab_csv(path)
+        except FileNotFoundError:
+            self._df = pd.DataFrame(columns=COLUMNS)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._df)
+
+    def load_frame(self):
+        with self._lock:
+            return self._df.copy()
+
+    def due_ids(self, today, limit=None):
+        with self._lock:
+            due = self._df[self._df['next_review'] <= today].sort_values('next_review')
+        ids = due.index.tolist()
+        return ids[:limit] if limit else ids
+
+    def find(self, word):
+        with self._lock:
+            return self._df.index[self._df['word'].str.lower() == word.lower()].tolist()
+
+    def add(self, row):
+        return self.add_many([row])[0]
+
+    def add_many(self, rows):
+        with self._lock:
+            start = int(self._df.index.max()) + 1 if len(self._df) else 0
+            ids = list(range(start, start + len(rows)))
+            self._df = pd.concat([self._df, pd.DataFrame(rows, index=ids, columns=COLUMNS)])
+        self.save()
+        return ids
+
+    def update_progress(self, row_id, last_review, next_review, interval):
+        with self._lock:
+            self._df.loc[row_id, ['last_review', 'next_review', 'interval']] = [last_review, next_review, int(interval)]
+        self.save()
+
+    def reschedule_many(self, updates):
+        with self._lock:
+            for row_id, next_review, interval in updates:
+                self._df.loc[row_id, ['next_review', 'interval']] = [next_review, int(interval)]
+        self.save()
+
+    def set_examples(self, updates):
+        with self._lock:
+            for row_id, example in updates:
+                self._df.at[row_id, 'example'] = example
+        self.save()
+
+    def load_settings(self):
+        try:
+            with io.open(self.settings_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def set_setting(self, key, value):
+        with self._lock:
+            settings = self.load_settings()
+            settings[key] = value
+            with io.open(self.settings_path, 'w', encoding='utf-8') as f:
+                json.dump(settings, f, ensure_ascii=False)
+
+    def import_csv(self, source):
+        df = read_vocab_csv(source)
+        return self.add_many(df.astype(object).where(df.notna(), None).to_dict('records'))
+
+    def export_csv(self, path=None):
+        with self._lock:
+            text = self._df.to_csv(index=False, encoding='utf-8')
+        if path is None:
+            return text
+        with io.open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+    def save(self):
+        self.export_csv(self.path)
+
+
+def open_store(backend="sqlite", path=None, seed_csv="vocab.csv"):
+    """backend: "sqlite" (默认) 或 "csv"；SQLite 库第一次创建时从 seed_csv 导入"""
+    if backend == "csv":
+        return CSVStore(path or seed_csv)
+    path = path or "vocab.db"
+    fresh = not os.path.exists(path)
+    store = SQLiteStore(path)
+    if fresh and seed_csv and os.path.exists(seed_csv):
+        store.import_csv(seed_csv)
+    return store
+
+
+def open_path(path):
+    """命令行工具用：按扩展名选后端；SQLite 库和 App 一样，第一次建时从同目录的 vocab.csv 导入"""
+    if path.endswith(".csv"):
+        return open_store("csv", path)
+    return open_store("sqlite", path, seed_csv=os.path.join(os.path.dirname(path), "vocab.csv"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vocabulary storage tools")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_migrate = sub.add_parser("migrate", help="import a vocab.csv into a SQLite database")
+    p_migrate.add_argument("csv")
+    p_migrate.add_argument("db")
+    p_export = sub.add_parser("export", help="export a SQLite database to CSV")
+    p_export.add_argument("db")
+    p_export.add_argument("csv")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "migrate":
+        store = SQLiteStore(args.db)
+        if len(store):
+            parser.error(f"{args.db} already has {len(store)} words; refusing to import twice")
+        ids = store.import_csv(args.csv)
+        print(f"imported {len(ids)} words into {args.db}")
+    else:
+        SQLiteStore(args.db).export_csv(args.csv)
+        print(f"exported {args.db} -> {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
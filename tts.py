@@ -0,0 +1,192 @@
+"""🗣️ 可插拔的 TTS 后端：gTTS (联网) 和本地引擎 (espeak-ng / piper，子进程调用)
+
+    python tts.py list
+    python tts.py say "le chat" [--backend espeak] [-o chat.wav]
+    python tts.py render vocab.db [--backend auto] [--workers 4]     # 整副牌预渲染进音频缓存 (也可以给 .csv)
+
+每个后端都是一个可调用对象 backend(text, lang, slow) -> 音频字节 (mp3 或 wav)，
+直接当 AudioCache 的 renderer 用。部署时用 VOCAB_TTS 环境变量选后端：
+gtts / espeak / piper / auto (默认：gTTS，失败或熔断时自动退到本机装了的本地引擎)。
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from importlib.util import find_spec
+
+import audio_cache
+import profiler
+from breaker import CircuitBreaker
+
+DEFAULT_BACKEND = os.environ.get("VOCAB_TTS", "auto")
+PIPER_MODEL = os.environ.get("VOCAB_PIPER_MODEL", "fr_FR-siwis-medium.onnx")
+
+
+class TTSError(Exception):
+    pass
+
+
+class GTTSBackend:
+    name = "gtts"
+    format = "mp3"
+
+    def available(self):
+        return find_spec("gtts") is not None
+
+    def __call__(self, text, lang='fr', slow=False):
+        # 运行时再取 audio_cache.render_gtts，基准和测试里替换掉它就不会联网
+        return audio_cache.render_gtts(text, lang, slow)
+
+
+class SubprocessBackend:
+    """本地引擎的共同部分：找可执行文件、跑子进程、超时和报错"""
+    name = ""
+    format = "wav"
+    executables = ()
+
+    def __init__(self, executable=None, timeout=20.0):
+        self.executable = executable or next(filter(None, map(shutil.which, self.executables)), None)
+        self.timeout = timeout
+
+    def available(self):
+        return self.executable is not None
+
+    def _run(self, args, text):
+        if not self.available():
+            raise TTSError(f"{self.name} is not installed")
+        # 文本走 stdin，不会被当成命令行参数解析
+        proc = subprocess.run([self.executable, *args], input=text.encode('utf-8'),
+                              capture_output=True, timeout=self.timeout)
+        if proc.returncode:
+            raise TTSError(f"{self.name} exited with {proc.returncode}: {proc.stderr.decode(errors='replace')[-200:]}")
+        return proc.stdout
+
+
+class EspeakBackend(SubprocessBackend):
+    name = "espeak"
+    executables = ("espeak-ng", "espeak")
+
+    def __call__(self, text, lang='fr', slow=False):
+        return self._run(["-v", lang, "-s", "120" if slow else "160", "--stdout", "--stdin"], text)
+
+
+class PiperBackend(SubprocessBackend):
+    """piper 的声音模型本身决定语言，lang 参数不起作用"""
+    name = "piper"
+    executables = ("piper",)
+
+    def __init__(self, model=PIPER_MODEL, **kwargs):
+        super().__init__(**kwargs)
+        self.model = model
+
+    def available(self):
+        return super().available() and os.path.exists(self.model)
+
+    def __call__(self, text, lang='fr', slow=False):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "out.wav")
+            self._run(["--model", self.model, "--output_file", out, "--length_scale", "1.4" if slow else "1.0"], text)
+            with open(out, 'rb') as f:
+                return f.read()
+
+
+class FallbackBackend:
+    """先用 primary (联网)，出错或熔断中就用 fallback (本地)；断网时不会每个词都等一次超时"""
+
+    def __init__(self, primary, fallback, breaker=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.breaker = breaker or CircuitBreaker(f"tts.{primary.name}", probe=lambda: primary("bonjour"))
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def available(self):
+        return self.primary.available() or self.fallback.available()
+
+    def stale(self, path):
+        """缓存里这个文件是断网时 fallback 渲染的，而 primary 现在是好的：该重新渲染了"""
+        fallback_ext = "." + getattr(self.fallback, 'format', "")
+        return (getattr(self.primary, 'format', None) != getattr(self.fallback, 'format', None)
+                and path.endswith(fallback_ext) and self.breaker.state == "closed")
+
+    def __call__(self, text, lang='fr', slow=False):
+        try:
+            return self.breaker.call(self.primary, text, lang, slow)
+        except Exception:
+            profiler.count("tts.fallback")
+            with self._lock:
+                self.fallbacks += 1
+            return self.fallback(text, lang, slow)
+
+
+LOCAL_BACKENDS = (PiperBackend, EspeakBackend)  # 都装了的话 piper 优先，声音更自然
+
+
+def make_backend(name=DEFAULT_BACKEND):
+    if name == "gtts":
+        return GTTSBackend()
+    if name == "espeak":
+        return EspeakBackend()
+    if name == "piper":
+        return PiperBackend()
+    if name == "auto":
+        local = next((backend for backend in (cls() for cls in LOCAL_BACKENDS) if backend.available()), None)
+        return FallbackBackend(GTTSBackend(), local) if local else GTTSBackend()
+    raise ValueError(f"unknown TTS backend {name!r} (gtts / espeak / piper / auto)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Text-to-speech backends")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="show which backends are usable here")
+    p_say = sub.add_parser("say", help="synthesize one utterance")
+    p_say.add_argument("text")
+    p_say.add_argument("--backend", default=DEFAULT_BACKEND)
+    p_say.add_argument("-o", "--output")
+    p_render = sub.add_parser("render", help="pre-render audio for every word of a vocab.db or vocab.csv")
+    p_render.add_argument("vocab", nargs="?", default="vocab.db")
+    p_render.add_argument("--backend", default=DEFAULT_BACKEND)
+    p_render.add_argument("--cache-dir", default="static/audio")
+    p_render.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "list":
+        for cls in (GTTSBackend, *LOCAL_BACKENDS):
+            backend = cls()
+            where = getattr(backend, 'executable', None) or ""
+            print(f"{backend.name:<8}{'yes' if backend.available() else 'no':<5}{where}")
+        print(f"auto -> {make_backend('auto').name}")
+    elif args.cmd == "say":
+        backend = make_backend(args.backend)
+        start = time.perf_counter()
+        data = backend(args.text)
+        output = args.output or f"say.{audio_cache.audio_format(data)}"
+        with open(output, 'wb') as f:
+            f.write(data)
+        print(f"{backend.name}: {len(data)} bytes in {time.perf_counter() - start:.2f}s -> {output}")
+    else:
+        from storage import open_path
+        words = open_path(args.vocab).load_frame()['word'].tolist()
+        backend = make_backend(args.backend)
+        cache = audio_cache.AudioCache(args.cache_dir, renderer=backend)
+        start = time.perf_counter()
+
+        def report(done, total):
+            print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+        rendered, failed = cache.ensure_many(words, workers=args.workers, progress=report)
+        print(file=sys.stderr)
+        elapsed = time.perf_counter() - start
+        print(f"{backend.name}: rendered {rendered}, failed {len(failed)}, "
+              f"already cached {len(set(words)) - rendered - len(failed)} in {elapsed:.1f}s")
+        for word in failed:
+            print(f"  ✗ {word}")
+
+
+if __name__ == "__main__":
+    main()
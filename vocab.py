@@ -0,0 +1,39 @@
+"""📒 词表的列定义和新词行的构造，App 和批量导入共用"""
+from datetime import date
+
+REQUIRED_COLS = ['word', 'meaning', 'gender', 'example']
+SRS_COLS = ['last_review', 'next_review', 'interval']
+
+ARTICLES = ("les ", "le ", "la ", "l'", "l’", "un ", "une ", "des ")
+
+
+def with_article(word, gender):
+    """名词按阴阳性补上冠词：chat + m. -> le chat"""
+    if word.lower().strip().startswith(ARTICLES):
+        return word
+    if "m." in gender or "masc" in gender:
+        return "le " + word
+    if "f." in gender or "fem" in gender:
+        return "la " + word
+    return word
+
+
+def strip_article(word):
+    """去重用的键：小写、去掉开头的冠词 (Le Chat / chat / l'amour -> chat / amour)"""
+    key = word.lower().strip()
+    for article in ARTICLES:
+        if key.startswith(article):
+            return key[len(article):].strip()
+    return key
+
+
+def make_row(word, meaning, gender, example=""):
+    return {
+        'word': word,
+        'meaning': meaning,
+        'gender': gender,
+        'example': example,
+        'last_review': None,
+        'next_review': date.today().isoformat(),
+        'interval': 0
+    }
@@ -0,0 +1,144 @@
+"""🏪 进程内共享的词表
+
+所有浏览器会话共用一份表和一份查找索引，不再每个会话 load_data() 一份拷贝；
+一个标签页里加的词、打的分，其他标签页下一次 rerun 就能看到。
+会话里只需要保存自己的复习队列和进度。
+
+所有读写都是按行的 O(1) 操作，放在同一把锁里；需要整张表时 (导出、同步) 拿一份拷贝。
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import profiler
+import srs
+from scheduler import Scheduler
+from word_index import WordIndex
+
+
+class VocabService:
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.RLock()
+        with profiler.span("vocab.load"):
+            self._df = store.load_frame()
+        with profiler.span("vocab.index"):
+            self._index = WordIndex.from_series(self._df['word'])
+            self.scheduler = Scheduler.from_frame(self._df)
+        self._settings = store.load_settings()
+        self.version = 0  # 每次写入 +1，会话可以用它判断表是否变过
+        self._arrays = None  # (version, 数组)；schedule_arrays() 按版本缓存
+
+    # --- 读 ---
+    def __len__(self):
+        with self._lock:
+            return len(self._df)
+
+    def __contains__(self, row_id):
+        with self._lock:
+            return row_id in self._df.index
+
+    def row(self, row_id):
+        with self._lock:
+            return self._df.loc[row_id].copy()
+
+    def words(self, row_ids):
+        with self._lock:
+            ids = [i for i in row_ids if i in self._df.index]
+            return self._df.loc[ids, 'word'].tolist()
+
+    def all_words(self):
+        with self._lock:
+            return self._df['word'].tolist()
+
+    def snapshot(self):
+        """整张表的一份拷贝，调用方可以随便用，不会和写入打架"""
+        with self._lock:
+            return self._df.copy()
+
+    def exact(self, query):
+        with self._lock:
+            return self._index.exact(query)
+
+    def suggest(self, query, limit=5):
+        """前缀 + 拼写相近的已有词"""
+        with self._lock:
+            ids = list(dict.fromkeys(self._index.prefix(query) + self._index.fuzzy(query)))
+            return self._df.loc[ids[:limit], 'word'].tolist()
+
+    def setting(self, key, default=None):
+        """调度设置从内存里读，不碰数据库"""
+        with self._lock:
+            return self._settings.get(key, default)
+
+    def session(self, today, size=50, new_limit=20):
+        """一轮复习的卡片 id，见 Scheduler.session"""
+        return self.scheduler.session(today, size, new_limit)
+
+    def schedule_arrays(self):
+        """(ids, interval, next_review, last_review) 的 NumPy 数组，给 srs 做整副牌的批量计算
+
+        表没变时直接复用上次转好的数组
+        """
+        with self._lock:
+            if self._arrays is None or self._arrays[0] != self.version:
+                self._arrays = (self.version, (
+                    self._df.index.to_numpy(),
+                    self._df['interval'].to_numpy(dtype=np.int32),
+                    srs.to_days(self._df['next_review']),
+                    srs.to_days(self._df['last_review']),
+                ))
+            return self._arrays[1]
+
+    # --- 写 ---
+    @profiler.timed("vocab.add")
+    def add(self, rows):
+        with self._lock:
+            ids = self.store.add_many(rows)
+            self._df = pd.concat([self._df, pd.DataFrame(rows, index=ids)])
+            for row_id, row in zip(ids, rows):
+                self._index.add(row_id, row['word'])
+                self.scheduler.add(row_id, row['next_review'], row.get('interval', 0))
+            self.version += 1
+        return ids
+
+    @profiler.timed("vocab.update")
+    def update_progress(self, row_id, last_review, next_review, interval):
+        with self._lock:
+            self.store.update_progress(row_id, last_review, next_review, interval)
+            self._df.loc[row_id, ['last_review', 'next_review', 'interval']] = [last_review, next_review, int(interval)]
+            self.scheduler.reschedule(row_id, next_review, interval)
+            self.version += 1
+
+    def reschedule_many(self, ids, next_reviews, intervals):
+        """批量改期 (摊平积压、换倍率)：一个事务写库，共享表和调度器一起更新；返回改动的行"""
+        updates = [(row_id, next_review, int(interval)) for row_id, next_review, interval in zip(ids, next_reviews, intervals)]
+        if not updates:
+            return []
+        with self._lock:
+            self.store.reschedule_many(updates)
+            ids = [row_id for row_id, _, _ in updates]
+            self._df.loc[ids, 'next_review'] = [next_review for _, next_review, _ in updates]
+            self._df.loc[ids, 'interval'] = [interval for _, _, interval in updates]
+            for row_id, next_review, interval in updates:
+                self.scheduler.reschedule(row_id, next_review, interval)
+            self.version += 1
+            return [row.to_dict() for _, row in self._df.loc[ids].iterrows()]
+
+    def set_setting(self, key, value):
+        with self._lock:
+            self.store.set_setting(key, value)
+            self._settings[key] = value
+
+    def set_examples(self, updates):
+        """批量填例句 [(id, example)]；返回改动的行"""
+        updates = list(updates)
+        if not updates:
+            return []
+        with self._lock:
+            self.store.set_examples(updates)
+            ids = [row_id for row_id, _ in updates]
+            self._df.loc[ids, 'example'] = [example for _, example in updates]
+            self.version += 1
+            return [row.to_dict() for _, row in self._df.loc[ids].iterrows()]
@@ -0,0 +1,184 @@
+"""📚 离线 Wiktionary 词性/阴阳性索引
+
+从 fr.wiktionary 的 XML 导出 (pages-articles.xml.bz2) 流式解析，抽出 词条 -> 词性 写进 SQLite。
+get_wiktionary_pos 先查这里，查不到才去联网抓网页。
+
+    python wiktionary_index.py build frwiktionary-latest-pages-articles.xml.bz2 [-o wiktionary_fr.sqlite]
+    python wiktionary_index.py lookup chat
+
+只认 XML 导出的 wikitext；标签和 lookup.parse_wiktionary_pos 保持一致 (m. (masc) / f. (fem) / ...)。
+"""
+import argparse
+import bz2
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+DEFAULT_INDEX_PATH = "wiktionary_fr.sqlite"
+
+# == {{langue|fr}} ==
+LANG_RE = re.compile(r"^==\s*\{\{langue\|([^}|]+)\}\}\s*==\s*$", re.M)
+# === {{S|nom|fr}} === 或旧写法 {{-nom-|fr}}
+POS_RE = re.compile(r"^===\s*\{\{(?:S\|([^}|]+)|-([^}|]+)-)[^}]*\}\}\s*===", re.M)
+GENDER_RE = re.compile(r"\{\{(m|f|mf|mf \?|genre \?)\}\}")
+
+POS_LABELS = {'nom': "n. (noun)", 'verbe': "v. (verb)", 'adjectif': "adj."}
+
+
+def _open_dump(path):
+    if path.endswith(".bz2"):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def iter_pages(fileobj):
+    """逐页 yield (title, wikitext)，解析完立刻释放节点，内存不随 dump 大小增长"""
+    context = ET.iterparse(fileobj, events=('start', 'end'))
+    _, root = next(context)
+    title = ns = text = None
+    for event, elem in context:
+        if event != 'end':
+            continue
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if tag == 'title':
+            title = elem.text
+        elif tag == 'ns':
+            ns = elem.text
+        elif tag == 'text':
+            text = elem.text
+        elif tag == 'page':
+            if ns == '0' and title and text:
+                yield title, text
+            title = ns = text = None
+            root.clear()
+
+
+def extract_pos(wikitext):
+    """从一页 wikitext 里找法语段落，返回词性标签；不是法语词条返回 None"""
+    fr_start, fr_end = None, len(wikitext)
+    for m in LANG_RE.finditer(wikitext):
+        if fr_start is not None:
+            fr_end = m.start()
+            break
+        if m.group(1).strip() == 'fr':
+            fr_start = m.end()
+    if fr_start is None:
+        return None
+    section = wikitext[fr_start:fr_end]
+
+    pos_match = POS_RE.search(section)
+    if not pos_match:
+        return None
+    kind = (pos_match.group(1) or pos_match.group(2)).strip()
+
+    # 和网页版一样：词性标题后第一行 '''词''' {{pron|...}} {{m}} 里的阴阳性优先
+    for line in section[pos_match.end():].splitlines():
+        if line.startswith("'''"):
+            gender = GENDER_RE.search(line)
+            if gender and gender.group(1) == 'm':
+                return "m. (masc)"
+            if gender and gender.group(1) == 'f':
+                return "f. (fem)"
+            break
+        if line.startswith("=="):
+            break
+    return POS_LABELS.get(kind)
+
+
+def build_index(dump_path, index_path=DEFAULT_INDEX_PATH, batch_size=5000, progress=None):
+    """流式建索引，返回 (扫描页数, 写入词条数)"""
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE entries (word TEXT PRIMARY KEY, pos TEXT NOT NULL) WITHOUT ROWID")
+
+    pages = written = 0
+    batch = []
+    with _open_dump(dump_path) as f:
+        for title, text in iter_pages(f):
+            pages += 1
+            pos = extract_pos(text)
+            if pos:
+                batch.append((title.strip().lower(), pos))
+            if len(batch) >= batch_size:
+                written += _flush(conn, batch)
+                if progress:
+                    progress(pages, written)
+    written += _flush(conn, batch)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp_path, index_path)
+    return pages, written
+
+
+def _flush(conn, batch):
+    before = conn.total_changes
+    conn.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?)", batch)
+    batch.clear()
+    return conn.total_changes - before
+
+
+class WiktionaryIndex:
+    """只读查询；一个连接在多线程之间共享，用锁串行化"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def lookup(self, word):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pos FROM entries WHERE word = ?", (word.strip().lower(),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def open_index(path=DEFAULT_INDEX_PATH):
+    """索引文件不存在就返回 None，调用方直接走网络"""
+    if not os.path.exists(path):
+        return None
+    return WiktionaryIndex(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Wiktionary gender/POS index")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="build the index from a pages-articles XML(.bz2) dump")
+    p_build.add_argument("dump")
+    p_build.add_argument("-o", "--output", default=DEFAULT_INDEX_PATH)
+    p_lookup = sub.add_parser("lookup", help="look up words in an existing index")
+    p_lookup.add_argument("words", nargs="+")
+    p_lookup.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        start = time.perf_counter()
+
+        def report(pages, written):
+            rate = pages / (time.perf_counter() - start)
+            print(f"\r{pages} pages, {written} entries ({rate:.0f} pages/s)", end="", file=sys.stderr, flush=True)
+
+        pages, written = build_index(args.dump, args.output, progress=report)
+        print(file=sys.stderr)
+        print(f"{written} entries from {pages} pages in {time.perf_counter() - start:.1f}s -> {args.output}")
+    else:
+        index = WiktionaryIndex(args.index)
+        for word in args.words:
+            print(f"{word}\t{index.lookup(word) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""🔤 词表查找索引
+
+把每个词归一化 (casefold、去重音、去冠词) 后映射到行号，支持：
+- 精确查找：dict，O(1)
+- 前缀查找：排好序的键 + bisect，用于输入提示
+- 模糊查找：删除邻域 (SymSpell 的做法)，大致是编辑距离 1，不用扫全表
+新增单词时增量更新，不必重建。
+"""
+import bisect
+import unicodedata
+
+from vocab import ARTICLES
+
+
+def normalize(word):
+    """Le Café -> cafe, l'Amour -> amour"""
+    key = unicodedata.normalize('NFKD', str(word).casefold().strip())
+    key = "".join(ch for ch in key if not unicodedata.combining(ch))
+    for article in ARTICLES:
+        if key.startswith(article):
+            key = key[len(article):].strip()
+            break
+    return key
+
+
+def _deletes(key):
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+class WordIndex:
+    def __init__(self, words=()):
+        self._rows = {}      # 归一化键 -> [行号]
+        self._keys = []      # 排好序的键，前缀查找用
+        self._deletes = {}   # 删掉一个字母后的串 -> {键}
+        for row_id, word in words:
+            self._insert(row_id, word)
+        self._keys = sorted(self._rows)  # 批量建索引时最后排一次序，不逐个 insort
+
+    @classmethod
+    def from_series(cls, series):
+        return cls(series.items())
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, row_id, word):
+        key = self._insert(row_id, word)
+        if key is not None:
+            bisect.insort(self._keys, key)
+
+    def _insert(self, row_id, word):
+        """写入 dict 和删除邻域；返回新出现的键 (已有的键返回 None)"""
+        key = normalize(word)
+        if not key:
+            return None
+        rows = self._rows.get(key)
+        if rows is not None:
+            rows.append(row_id)
+            return None
+        self._rows[key] = [row_id]
+        for variant in _deletes(key):
+            self._deletes.setdefault(variant, set()).add(key)
+        return key
+
+    def exact(self, query):
+        return list(self._rows.get(normalize(query), ()))
+
+    def prefix(self, query, limit=8):
+        key = normalize(query)
+        if not key:
+            return []
+        out = []
+        i = bisect.bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key) and len(out) < limit:
+            out.extend(self._rows[self._keys[i]])
+            i += 1
+        return out[:limit]
+
+    def fuzzy(self, query, limit=8):
+        """拼错一个字母 (漏打/多打/打错/相邻颠倒) 的候选，精确命中的不算"""
+        key = normalize(query)
+        if not key:
+            return []
+        candidates = set(self._deletes.get(key, ()))           # 查询漏打了一个字母
+        for variant in _deletes(key):
+            if variant in self._rows:                           # 查询多打了一个字母
+                candidates.add(variant)
+            candidates.update(self._deletes.get(variant, ()))  # 打错或颠倒了一个字母
+        candidates.discard(key)
+        out = []
+        for candidate in sorted(candidates):
+            out.extend(self._rows[candidate])
+            if len(out) >= limit:
+                break
+        return out[:limit]
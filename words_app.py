@@ -1,16 +1,31 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import datetime
-from datetime import date, timedelta
-import random
-import io
-import base64
-import requests
+from datetime import date
+import html
 import time
-from bs4 import BeautifulSoup
-from gtts import gTTS
-from deep_translator import GoogleTranslator
-from github import Github, Auth
+import uuid
+from collections import deque
+from itertools import islice
+
+from audio_cache import AudioCache, audio_src, audio_tag
+from breaker import CircuitOpen
+from bulk_import import enrich_words, read_word_list
+from cache_store import CacheStore
+import example_index
+from github_sync import SyncManager
+from lazy import LOAD_TIMES, lazy
+from lookup import BREAKERS, LookupConfig, LookupEngine, call_with_retries, degraded, fetch_translation, fetch_wiktionary_pos
+import profiler
+import review_log
+import srs
+from storage import open_store
+from tts import DEFAULT_BACKEND, make_backend
+from vocab import make_row, with_article
+from vocab_service import VocabService
+from wiktionary_index import open_index
+
+github = lazy("github")  # 只有配了同步、第一次推送时才 import PyGithub
 
 # ==========================================
 # 1. 页面配置
@@ -22,6 +37,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ⏱️ 整页 rerun 从这里开始计时；卡片 fragment 单独重画时不会经过这里
+PAGE_START = time.perf_counter()
+st.session_state.full_rerun = True
+if 'session_tag' not in st.session_state:
+    st.session_state.session_tag = uuid.uuid4().hex[:6]
+# 🐞 剖析 (默认关闭)：按钮回调已经开了 run 的话接着用，回调里的打分、同步也算进来
+profiler.begin_run("page", st.session_state.session_tag, resume='interaction_start' in st.session_state)
+
 # ==========================================
 # 2. 🎨 UI/UX 设计 (Ratatouille & Ernest Style)
 # ==========================================
@@ -145,6 +168,7 @@ st.markdown("""
     .french-word { font-family: 'Playfair Display', serif; font-size: 64px; font-weight: 600; color: #C65D3B; margin-bottom: 5px; letter-spacing: 1px; line-height: 1.1; }
     .word-meta { font-family: 'Patrick Hand', cursive; font-size: 24px; color: #78909C; font-style: italic; }
     .word-meaning { font-family: 'Patrick Hand', cursive; font-size: 32px; color: #5D4037; display: inline-block; padding: 10px 25px; border-radius: 12px; background-color: #F9F7F1; }
+    .word-example { font-family: 'Patrick Hand', cursive; font-size: 20px; color: #8D6E63; margin-top: 18px; }
 
     /* 音频按钮 */
     div.row-widget.stButton > button {
@@ -178,211 +202,463 @@ st.markdown("""
 # 3. 核心功能函数
 # ==========================================
 
+# "url": 音频写进 static/ 目录，页面按内容哈希引用 (需要 server.enableStaticServing)
+# "inline": 旧做法，base64 直接塞进页面
+AUDIO_MODE = "url"
+AUDIO_CACHE_DIR = "static/audio"
+AUDIO_URL_PREFIX = "app/static/audio"
+AUDIO_CACHE_MAX_BYTES = 200 * 1024 * 1024
+AUDIO_PREFETCH = 5  # 复习时提前渲染后面几张卡片的发音
+TTS_BACKEND = DEFAULT_BACKEND  # "gtts" / "espeak" / "piper" / "auto" (gTTS，断网时退到本地引擎)；默认读 VOCAB_TTS
+TTS_BATCH_WORKERS = 4  # 整副牌预渲染时的并发数
+
+@st.cache_resource
+def get_audio_cache():
+    # 进程级单例：所有会话共用同一个磁盘缓存和预渲染线程池
+    return AudioCache(AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES, renderer=make_backend(TTS_BACKEND))
+
 def play_audio_hidden(text, lang='fr'):
     if not text: return
     try:
-        tts = gTTS(text=text, lang=lang, slow=False)
-        fp = io.BytesIO()
-        tts.write_to_fp(fp)
-        b64 = base64.b64encode(fp.getvalue()).decode()
+        with profiler.span("audio.tag"):
+            src = audio_src(get_audio_cache(), text, lang=lang, mode=AUDIO_MODE, url_prefix=AUDIO_URL_PREFIX)
         
         # 使用时间戳作为唯一ID，强迫浏览器重新加载
         timestamp = int(time.time() * 1000000)
-        
-        md = f"""
-            <audio autoplay style="display:none;" id="audio_{timestamp}">
-            <source src="data:audio/mp3;base64,{b64}" type="audio/mp3">
-            </audio>
-            <div style="display:none;">{timestamp}</div>
-            """
-        st.markdown(md, unsafe_allow_html=True)
-    except Exception:
-        pass
+        st.markdown(audio_tag(src, timestamp), unsafe_allow_html=True)
+    except Exception as e:
+        # 所有后端都失败了 (没网、也没装本地引擎)：告诉用户，而不是默默没声音
+        profiler.count("audio.error")
+        st.toast(f"No audio for « {text} » ({type(e).__name__})", icon="🔇")
+
+LOOKUP_CACHE_PATH = ".cache/lookups.sqlite"
+LOOKUP_CACHE_TTL = 30 * 24 * 3600  # 翻译和词性基本不会变，缓存一个月
+LOOKUP_NEGATIVE_TTL = 120          # 查失败的词两分钟内不再重查，网络恢复后很快会重新查
+
+@st.cache_resource
+def get_cache_store():
+    return CacheStore(LOOKUP_CACHE_PATH)
 
-@st.cache_data(show_spinner=False)
+lookup_cache = get_cache_store()
+
+LOOKUP_CONFIG = LookupConfig(
+    timeouts={'translation': 5.0, 'gender': 5.0},
+    retries={'translation': 1, 'gender': 1},
+)
+
+# 失败时的返回值 ("" / "Unknown") 不进正常缓存，只短暂记一下；熔断中直接抛 CircuitOpen，什么都不记
+@lookup_cache.cached("translation", ttl=LOOKUP_CACHE_TTL, cache_if=bool, negative_ttl=LOOKUP_NEGATIVE_TTL)
 def translate_text(text):
     try:
-        cn_meaning = GoogleTranslator(source='fr', target='zh-CN').translate(text)
-        return cn_meaning
+        return call_with_retries(
+            fetch_translation, text,
+            retries=LOOKUP_CONFIG.retries['translation'], backoff=LOOKUP_CONFIG.backoff,
+        )
+    except CircuitOpen:
+        raise
     except Exception:
         return ""
 
-@st.cache_data(show_spinner="Searching...")
+@st.cache_resource
+def get_wiktionary_index():
+    # 用 wiktionary_index.py 从 dump 建好的离线索引；没有就返回 None，全部走网络
+    return open_index()
+
+wiktionary_index = get_wiktionary_index()
+
+@st.cache_resource
+def get_example_index():
+    # 用 example_index.py 从 Tatoeba 句对建好的例句索引 (mmap)；没有就返回 None，例句留空
+    return example_index.open_index()
+
+examples = get_example_index()
+
+@lookup_cache.cached("gender", ttl=LOOKUP_CACHE_TTL, cache_if=lambda pos: pos != "Unknown", negative_ttl=LOOKUP_NEGATIVE_TTL)
 def get_wiktionary_pos(word):
-    word = word.strip().lower()
-    url = f"https://fr.wiktionary.org/wiki/{word}"
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
-    pos = "Unkown"      
+    # 离线索引在熔断器前面：Wiktionary 挂了，索引里有的词照样能查到
     try:
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            fr_section = soup.find(id="Français")
-            if fr_section:
-                parent = fr_section.find_parent()
-                gender_line = parent.find_next('span', class_='ligne-de-forme')
-                if gender_line:
-                    text = gender_line.get_text().lower()
-                    if 'masculin' in text or ' m' in text: pos = "m. (masc)"
-                    elif 'féminin' in text or ' f' in text: pos = "f. (fem)"
-                
-                if pos == "Unkown":
-                    all_pos_headers = soup.find_all('span', class_='titredef')
-                    for header in all_pos_headers:
-                        if 'nom' in header.get_text().lower():
-                            next_line = header.find_next('p')
-                            if next_line:
-                                txt = next_line.get_text().lower()
-                                if 'masculin' in txt: 
-                                    pos = "m. (masc)"
-                                    break
-                                elif 'féminin' in txt: 
-                                    pos = "f. (fem)"
-                                    break
-                            pos = "n. (noun)"
-                        elif 'verbe' in header.get_text().lower():
-                            pos = "v. (verb)"
-                            break
-                        elif 'adjectif' in header.get_text().lower():
-                            pos = "adj."
-                            break
-        return pos
+        return call_with_retries(
+            fetch_wiktionary_pos, word, timeout=LOOKUP_CONFIG.timeouts['gender'], index=wiktionary_index,
+            retries=LOOKUP_CONFIG.retries['gender'], backoff=LOOKUP_CONFIG.backoff,
+        )
+    except CircuitOpen:
+        raise
     except Exception:
         return "Unknown"
 
+LOOKUP_SERVICES = {'translation': "Google Translate", 'wiktionary': "Wiktionary"}  # lookup.BREAKERS 的显示名
+
+@st.cache_resource
+def get_lookup_engine():
+    # 服务恢复时清掉断网期间记下的失败结果，不用等它们过期
+    for breaker in BREAKERS.values():
+        breaker.on_recover = lambda: [lookup_cache.invalidate(f"{ns}.failed") for ns in ("translation", "gender")]
+    return LookupEngine({
+        'translation': (translate_text, ""),
+        'gender': (get_wiktionary_pos, "Unknown"),
+    }, config=LOOKUP_CONFIG, breakers={'translation': BREAKERS['translation'], 'gender': BREAKERS['wiktionary']})
+
+def render_dict_card(slot, word, pos, meaning):
+    slot.markdown(f"""
+    <div class="menu-card">
+        <div class="french-word">{word}</div>
+        <div class="word-meta">{pos}</div>
+        <div class="menu-divider"></div>
+        <div class="word-meaning">{meaning}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def example_html(example):
+    example = str(example or "").strip()
+    return f'<div class="word-example">« {html.escape(example)} »</div>' if example else ""
+
+def get_multiplier():
+    """答对时间隔乘的倍数；侧边栏改过就和词表一起存在 settings 表里"""
+    return vocab.setting("multiplier", srs.MULTIPLIER)
+
 def update_word_progress(word_row, quality):
-    today = date.today()
-    current_interval = int(word_row.get('interval', 0))
-    if quality == 0:
-        new_interval = 1
-    else:
-        new_interval = 1 if current_interval == 0 else int(current_interval * 2.2)
-    word_row['last_review'] = today.isoformat()
-    word_row['next_review'] = (today + timedelta(days=new_interval)).isoformat()
-    word_row['interval'] = new_interval
+    # 单张卡就是长度为 1 的数组，规则都在 srs 里
+    intervals, due = srs.review([int(word_row.get('interval', 0))], [quality], multiplier=get_multiplier())
+    word_row['last_review'] = date.today().isoformat()
+    word_row['next_review'] = srs.to_iso(due)[0]
+    word_row['interval'] = int(intervals[0])
     return word_row
 
 # --- ☁️ GitHub 同步功能 ---
-def sync_to_github():
-    """将当前的 session_state 数据写入 GitHub 仓库"""
-    try:
-        github_token = st.secrets["github"]["token"]
-        repo_name = st.secrets["github"]["repo_name"]
-        g = Github(auth=Auth.Token(github_token))
-        repo = g.get_repo(repo_name)
-        contents = repo.get_contents("vocab.csv")
-        csv_content = st.session_state.df_all.to_csv(index=False, encoding='utf-8')
-        repo.update_file(contents.path, "Update vocab via App", csv_content, contents.sha)
-        return True, "Synced!"
-    except Exception as e:
-        return False, f"Error: {e}"
-
-REQUIRED_COLS = ['word', 'meaning', 'gender', 'example'] 
-SRS_COLS = ['last_review', 'next_review', 'interval']
-
-def load_data():
-    try:
-        df = pd.read_csv("vocab.csv", encoding='utf-8', keep_default_na=False, quotechar='"')
-        df.columns = df.columns.str.strip()
-        for col in SRS_COLS:
-            if col not in df.columns:
-                df[col] = None if col == 'last_review' else 0
-        if 'next_review' in df.columns:
-            df['next_review'] = pd.to_datetime(df['next_review'], errors='coerce')
-            df['next_review'] = df['next_review'].dt.strftime('%Y-%m-%d')
-            df['next_review'] = df['next_review'].fillna(date.today().isoformat())
-        return df
-    except Exception:
-        return pd.DataFrame(columns=REQUIRED_COLS + SRS_COLS)
-
-if 'df_all' not in st.session_state:
-    st.session_state.df_all = load_data()
-
-df = st.session_state.df_all
+SYNC_WAL_PATH = ".cache/sync_wal.jsonl"
+SYNC_DEBOUNCE = 30.0   # 停手 30 秒后再提交，一轮复习合成一次 commit
+SYNC_MAX_EVENTS = 100  # 攒够这么多事件就不等了
+
+@st.cache_resource
+def get_sync():
+    """进程级的同步器；没配置 GitHub 时返回 None"""
+    if "github" not in st.secrets:
+        return None
+    github_token = st.secrets["github"]["token"]
+    repo_name = st.secrets["github"]["repo_name"]
+    def connect():
+        return github.Github(auth=github.Auth.Token(github_token)).get_repo(repo_name)
+    return SyncManager(connect, wal_path=SYNC_WAL_PATH, debounce=SYNC_DEBOUNCE, max_events=SYNC_MAX_EVENTS)
+
+sync = get_sync()
+
+REVIEW_LOG_PATH = ".cache/review_log.bin"
+
+@st.cache_resource
+def get_review_log():
+    # 每次打分追加一条历史记录，攒一批再写盘，所有会话共用
+    return review_log.ReviewLog(REVIEW_LOG_PATH)
+
+history = get_review_log()
+
+REVIEW_SESSION_SIZE = 50  # 每轮最多多少张
+REVIEW_NEW_LIMIT = REVIEW_SESSION_SIZE  # 其中最多多少个没背过的新词；默认不另设上限，和以前一样整轮都可以是新词
+
+STORAGE_BACKEND = "sqlite"  # "csv": 旧的整表 CSV 存储；SQLite 库第一次建时会从 vocab.csv 导入
+
+@st.cache_resource
+def get_store():
+    return open_store(STORAGE_BACKEND)
+
+store = get_store()
+
+@st.cache_resource
+def get_vocab():
+    # 整个进程共用一份词表和查找索引；会话里只放复习队列和进度
+    service = VocabService(store)
+    if sync is not None and sync.status()['pending']:
+        # 上次没来得及推上去的修改 (本地库里已经有了)
+        sync.flush_soon(service.snapshot)
+    return service
+
+vocab = get_vocab()
+
+def add_words(rows):
+    """新词写库、进共享表和索引、记一笔同步"""
+    ids = vocab.add(rows)
+    if sync is not None: sync.record('insert', rows, vocab.snapshot)
+    return ids
+
+def reschedule_words(ids, due, intervals):
+    """批量改期 (摊平积压、换倍率)，一次写库、一次记同步"""
+    rows = vocab.reschedule_many(ids, srs.to_iso(due), intervals)
+    if sync is not None and rows: sync.record('reschedule', rows, vocab.snapshot)
+    return len(rows)
+
+def fill_examples():
+    """给 example 为空的词从离线索引补一句，一次写库、一次记同步"""
+    df = vocab.snapshot()
+    updates = [(df.index[i], example) for i, example in example_index.backfill(df['word'], df['example'], examples)]
+    rows = vocab.set_examples(updates)
+    if sync is not None and rows: sync.record('example', rows, vocab.snapshot)
+    return len(rows)
+
+def grade_word(row_id, quality):
+    """打分：只 UPDATE 这一行，再往历史里追加一条"""
+    row = vocab.row(row_id)
+    last_review, prev_interval = row.get('last_review'), int(row.get('interval', 0))
+    row = update_word_progress(row, quality)
+    vocab.update_progress(row_id, row['last_review'], row['next_review'], row['interval'])
+    history.append(row_id, quality, last_review, prev_interval, row['interval'])
+    if sync is not None: sync.record('grade', [row], vocab.snapshot)
+
+# --- ⏱️ 交互计时 ---
+TIMING_KEEP = 20  # 每个会话保留最近多少次交互
+
+def start_interaction():
+    """按钮回调里调用：从点击那一刻开始算"""
+    profiler.begin_run("click", st.session_state.session_tag)
+    st.session_state.interaction_start = time.perf_counter()
+
+def finish_interaction(scope, start=None):
+    """scope: "page" = 整个脚本重跑，"card" = 只重画了卡片 fragment"""
+    start = st.session_state.pop('interaction_start', None) or start
+    if start is None:
+        return
+    if 'timings' not in st.session_state:
+        st.session_state.timings = deque(maxlen=TIMING_KEEP)
+    st.session_state.timings.append((scope, (time.perf_counter() - start) * 1000))
+
+def begin_card():
+    # 整页 rerun 里顺带画的卡片算在 page 里，只有 fragment 自己重跑才记成 card
+    if not st.session_state.full_rerun:
+        profiler.begin_run("card", st.session_state.session_tag, resume='interaction_start' in st.session_state)
+    return time.perf_counter()
+
+def finish_card(start):
+    if not st.session_state.full_rerun:
+        finish_interaction("card", start)
+        profiler.end_run()
+
+def timing_caption():
+    last = {scope: ms for scope, ms in st.session_state.get('timings', ())}
+    if last:
+        st.caption(" · ".join(f"⏱️ {scope} {ms:.0f} ms" for scope, ms in sorted(last.items())))
 
 # ==========================================
 # 5. 侧边栏
 # ==========================================
-with st.sidebar:
+with st.sidebar, profiler.span("render.sidebar"):
     st.markdown("<h1 style='font-size:24px; color:#5D4037;'>🧑‍🍳 Chef's Kitchen</h1>", unsafe_allow_html=True)
     app_mode = st.radio("Mode", ["🔍 Dictionnaire", "📖 Review"])
     st.divider()
+
+    audio_stats = get_audio_cache().stats()
+    if audio_stats['hits'] or audio_stats['misses']:
+        voice = get_audio_cache().renderer
+        fallbacks = getattr(voice, 'fallbacks', 0)
+        st.caption(
+            f"🔊 Audio cache: {audio_stats['hits']} hits / {audio_stats['misses']} misses "
+            f"· ~{audio_stats['saved_seconds']:.1f}s saved · voice {voice.name}"
+            + (f" ({fallbacks} offline)" if fallbacks else "")
+            + (f" · {audio_stats['waits']} played before prefetch finished" if audio_stats['waits'] else "")
+        )
+    
+    cache_stats = lookup_cache.stats()
+    lookups = {name: ns for name, ns in cache_stats['namespaces'].items()
+               if not name.endswith(".failed") and (ns['hits'] or ns['misses'])}
+    if lookups:
+        st.caption("🗄️ Lookup cache: " + " · ".join(
+            f"{name} {ns['entries']} entries, {ns['hit_rate']:.0%} hits" for name, ns in lookups.items()
+        ) + f" · {cache_stats['bytes'] / 1024:.0f} KiB")
+    offline = degraded()
+    if offline:
+        st.caption("🌩️ Offline: " + ", ".join(LOOKUP_SERVICES[name] for name in offline) + " (answering from cache)")
     
     # ☁️ 云端同步按钮
-    if "github" in st.secrets:
+    if sync is not None:
         if st.button("☁️ Sync to Cloud", type="primary", use_container_width=True):
-            with st.spinner("Syncing..."):
-                success, msg = sync_to_github()
-                if success:
-                    st.toast(msg, icon="✅")
-                else:
-                    st.error(msg)
+            sync.flush_soon(vocab.snapshot)
+            st.toast("Sync started", icon="☁️")
+        sync_status = sync.status()
+        if sync_status['last_error']:
+            st.caption(f"⚠️ Sync: {sync_status['last_error']}")
+        elif sync_status['pending']:
+            st.caption(f"☁️ {sync_status['pending']} changes waiting to sync")
+        elif sync_status['last_push']:
+            st.caption(f"☁️ Synced at {time.strftime('%H:%M', time.localtime(sync_status['last_push']))}")
     else:
-        csv_buffer = st.session_state.df_all.to_csv(index=False, encoding='utf-8').encode('utf-8')
+        # 点下载时才导出，平时 rerun 不碰整张表
         st.download_button(
             label="📥 Download CSV",
-            data=csv_buffer,
+            data=lambda: vocab.snapshot().to_csv(index=False, encoding='utf-8').encode('utf-8'),
             file_name="vocab.csv",
             mime="text/csv",
             type="primary"
         )
 
+    # 📈 未来的复习量：整副牌的到期日一次算完，按表的版本缓存
+    # 面板收起时什么都不算，也不画图 (图表要 import altair，冷启动能省几百毫秒)
+    workload = st.expander("📈 Workload", key="workload_panel", on_change="rerun")
+    if workload.open:
+        with workload:
+            ids, intervals, due, last_review = vocab.schedule_arrays()
+            today = np.datetime64(date.today(), 'D')
+            counts = srs.forecast(due, today, 365)
+            horizon = st.select_slider("Days ahead", options=[7, 30, 90, 365], value=30)
+            st.bar_chart(pd.DataFrame({'cards': counts[:horizon]}, index=pd.date_range(date.today(), periods=horizon)), height=160)
+            st.caption(f"Today {counts[0]} · next 7 days {counts[:7].sum()} · next year {counts.sum()}")
+
+            overdue = int((due < today).sum())
+            if overdue:
+                spread_days = st.number_input("Spread overdue over (days)", min_value=1, max_value=60, value=7)
+                if st.button(f"🧹 Spread {overdue} overdue cards", use_container_width=True):
+                    new_due, moved = srs.spread_overdue(due, today, spread_days)
+                    n = reschedule_words(ids[moved], new_due[moved], intervals[moved])
+                    st.toast(f"{n} cards spread over {spread_days} days", icon="🧹")
+                    st.rerun()
+
+            multiplier = get_multiplier()
+            new_multiplier = st.number_input("Interval multiplier", min_value=1.1, max_value=5.0, value=float(multiplier), step=0.1)
+            if new_multiplier != multiplier and st.button("Apply to all cards", use_container_width=True):
+                new_intervals, new_due, changed = srs.rescale(intervals, last_review, multiplier, new_multiplier, today)
+                n = reschedule_words(ids[changed], new_due, new_intervals)
+                vocab.set_setting("multiplier", new_multiplier)
+                st.toast(f"{n} cards rescheduled ×{new_multiplier:g}", icon="📈")
+                st.rerun()
+
+    # 📊 复习历史：展开时才读日志 (mmap，只取用到的列)
+    history_panel = st.expander("📊 History", key="history_panel", on_change="rerun")
+    if history_panel.open:
+        with history_panel:
+            history.flush()
+            log = review_log.read_log(REVIEW_LOG_PATH)
+            if not len(log):
+                st.caption("No reviews recorded yet.")
+            else:
+                info = review_log.summary(log)
+                retained = f"{info['retention']:.0%}" if info['retention'] is not None else "-"
+                st.caption(f"{info['reviews']} reviews · {info['words']} words · retention {retained}")
+                curve = review_log.retention(log, 30)
+                st.caption("Retention by days since last review")
+                st.line_chart(curve.loc[curve['reviews'] > 0, 'retention'], height=140)
+                st.caption("Reviews per day")
+                st.bar_chart(review_log.daily(log).tail(30)[['correct', 'new']], height=140)
+                worst = review_log.lapses(log).head(10)
+                worst = worst[worst['lapses'] > 0]
+                worst = worst[[row_id in vocab for row_id in worst.index]]
+                if len(worst):
+                    st.caption("Most forgotten")
+                    st.dataframe(pd.DataFrame({'word': vocab.words(worst.index), 'lapses': worst['lapses'].values}), hide_index=True)
+
+    # 📦 批量导入：整张词表一起查，最后只写一次、只同步一次
+    with st.expander("📦 Bulk import"):
+        uploaded = st.file_uploader("Word list (.txt / .csv)", type=["txt", "csv"])
+        if uploaded is not None and st.button("Import", use_container_width=True):
+            words = read_word_list(uploaded.getvalue().decode('utf-8-sig'))
+            bar = st.progress(0.0)
+            rows, failed = enrich_words(
+                words, vocab.all_words(),
+                translate=translate_text,
+                pos=get_wiktionary_pos,
+                example=examples.best if examples else None,
+                audio_cache=get_audio_cache(),
+                progress=lambda done, total: bar.progress(done / total, text=f"{done}/{total}"),
+            )
+            if rows:
+                add_words(rows)
+            st.toast(f"{len(rows)} added, {len(failed)} failed", icon="📦")
+            if failed:
+                st.caption("✗ " + ", ".join(failed))
+        if st.button("🔊 Render missing audio", use_container_width=True):
+            # 整副牌缺的发音一次在线程池里渲染完，之后复习完全不用等 TTS
+            bar = st.progress(0.0)
+            rendered, failed = get_audio_cache().ensure_many(
+                vocab.all_words(), workers=TTS_BATCH_WORKERS,
+                progress=lambda done, total: bar.progress(done / total, text=f"{done}/{total}"),
+            )
+            st.toast(f"{rendered} rendered, {len(failed)} failed", icon="🔊")
+        if examples is not None and st.button("📝 Fill missing examples", use_container_width=True):
+            st.toast(f"{fill_examples()} examples added", icon="📝")
+
+    # 🐞 调试面板：地址栏加 ?debug=1 或者设了 VOCAB_PROFILE=1 才出现
+    if profiler.enabled or st.query_params.get("debug"):
+        debug = st.expander("🐞 Profiling", key="debug_panel", on_change="rerun")
+        if debug.open:
+            with debug:
+                st.toggle("Record timings", value=profiler.enabled, key="profiling_on",
+                          on_change=lambda: profiler.enable(st.session_state.profiling_on))
+                runs = [run for run in profiler.RUNS if run['session'] == st.session_state.session_tag][-15:]
+                if runs:
+                    st.caption("Recent reruns (this session)")
+                    st.dataframe(pd.DataFrame([{
+                        'kind': run['kind'],
+                        'ms': round(run['total_ms']),
+                        'slowest': ", ".join(f"{name} {sum(ms):.0f}" for name, ms in
+                                             sorted(run['spans'].items(), key=lambda kv: -sum(kv[1]))[:3]),
+                    } for run in reversed(runs)]), hide_index=True)
+                totals = profiler.summary()
+                if totals:
+                    st.caption("All sessions")
+                    st.dataframe(pd.DataFrame(totals, columns=["span", "n", "avg ms", "max ms"]).round(1), hide_index=True)
+                if profiler.COUNTERS:
+                    st.caption(" · ".join(f"{name} {n}" for name, n in sorted(profiler.COUNTERS.items())))
+                if LOAD_TIMES:
+                    st.caption("💤 Lazy imports: " + " · ".join(f"{name} {s * 1000:.0f} ms" for name, s in LOAD_TIMES.items()))
+                st.download_button("📥 runs.jsonl", data=lambda: profiler.export_jsonl().encode('utf-8'),
+                                   file_name="runs.jsonl", mime="application/jsonl", use_container_width=True)
+
 # ==========================================
 # 6. 查单词模式
 # ==========================================
 if app_mode == "🔍 Dictionnaire":
-    
-    st.markdown("<h1 style='text-align:center;'>Le Dictionnaire</h1>", unsafe_allow_html=True)
-    
-    search_query = st.text_input("", placeholder="", label_visibility="collapsed").strip()
-    
-    auto_cn, auto_pos = "", ""
 
-    if search_query:
-        # === 逻辑：只有当输入改变时，才自动播放 ===
-        # 使用 Session State 记录上一次播放的词
-        if 'last_dict_play' not in st.session_state:
-            st.session_state.last_dict_play = ""
-            
-        if st.session_state.last_dict_play != search_query:
-            play_audio_hidden(search_query)
-            st.session_state.last_dict_play = search_query
+    @st.fragment
+    def dict_result(search_query):
+        # 发音、加词只重画这张卡片，不重跑整个页面
+        start = begin_card()
+        match_ids = vocab.exact(search_query)
 
-        match = df[df['word'].str.lower() == search_query.lower()]
+        head = st.container()
+        card_slot = st.empty()
         
-        if not match.empty:
-            exist_word = match.iloc[0]
+        if match_ids:
+            exist_word = vocab.row(match_ids[0])
             display_word = exist_word['word']
             display_pos = exist_word['gender']
             display_meaning = exist_word['meaning']
             is_new = False
         else:
-            with st.spinner("Cooking..."):
-                auto_cn = translate_text(search_query)
-                auto_pos = get_wiktionary_pos(search_query)
+            # 翻译和词性同时查，翻译先回来就先把卡片画出来
             display_word = search_query
-            display_pos = auto_pos
-            display_meaning = auto_cn
+            found = {'translation': "", 'gender': "…"}
+            timings = {}
+            down = degraded()
+            # 熔断中的服务会立刻返回，不用转圈；只剩缓存和离线索引能用
+            with st.spinner("Cooking..." if len(down) < len(LOOKUP_SERVICES) else "Offline: checking cache..."):
+                for source, value, elapsed in get_lookup_engine().lookup(search_query):
+                    found[source] = value
+                    timings[source] = elapsed
+                    if found['translation']:
+                        render_dict_card(card_slot, display_word, found['gender'], found['translation'])
+            display_pos = found['gender']
+            display_meaning = found['translation']
             is_new = True
+            down = degraded()
+            if down:
+                st.caption("🌩️ Mode dégradé: " + " · ".join(
+                    f"{LOOKUP_SERVICES[name]} unreachable, retrying in the background" for name in down))
 
         if display_meaning:
-            st.markdown("<div style='height: 15px;'></div>", unsafe_allow_html=True)
-            col1, col2, col3 = st.columns([1, 1, 1])
-            with col2:
-                # 🌟 修改点：点击按钮时，强制调用 play_audio_hidden
-                if st.button("🔊 Pronunciation", key="dict_audio", use_container_width=True):
-                    play_audio_hidden(search_query)
-
-            st.markdown(f"""
-            <div class="menu-card">
-                <div class="french-word">{display_word}</div>
-                <div class="word-meta">{display_pos}</div>
-                <div class="menu-divider"></div>
-                <div class="word-meaning">{display_meaning}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            with head:
+                st.markdown("<div style='height: 15px;'></div>", unsafe_allow_html=True)
+                col1, col2, col3 = st.columns([1, 1, 1])
+                with col2:
+                    # 🌟 修改点：点击按钮时，强制调用 play_audio_hidden
+                    if st.button("🔊 Pronunciation", key="dict_audio", use_container_width=True, on_click=start_interaction):
+                        play_audio_hidden(search_query)
+
+            render_dict_card(card_slot, display_word, display_pos, display_meaning)
 
             if is_new:
+                suggestions = vocab.suggest(search_query)
+                if suggestions:
+                    st.caption("💡 Déjà au menu : " + " · ".join(suggestions))
+                recent = get_lookup_engine().timings()  # 最近若干次查询的分位数，看出这次是不是偶然慢
+                st.caption(" · ".join(
+                    f"⏱️ {source} {elapsed * 1000:.0f} ms"
+                    + (f" (p50 {recent[source]['p50_ms']:.0f} / p95 {recent[source]['p95_ms']:.0f})" if source in recent else "")
+                    for source, elapsed in timings.items()))
                 st.caption("📝 Add to Menu")
                 with st.form("add_word_form"):
                     col_a, col_b = st.columns([1, 2])
@@ -390,36 +666,42 @@ if app_mode == "🔍 Dictionnaire":
                         final_gender = st.text_input("Gender", value=display_pos)
                     with col_b:
                         final_meaning = st.text_input("Meaning", value=display_meaning)
+                    final_example = st.text_input("Example", value=examples.best(search_query) if examples else "")
                     
                     final_word = search_query 
                     
-                    if st.form_submit_button("🍽️ Ajouter", type="primary"):
-                        check_word = final_word.lower().strip()
-                        has_article = check_word.startswith(("le ", "la ", "l'", "un ", "une "))
-                        if not has_article:
-                            if "m." in final_gender or "masc" in final_gender:
-                                final_word = "le " + final_word
-                            elif "f." in final_gender or "fem" in final_gender:
-                                final_word = "la " + final_word
-
-                        new_row = {
-                            'word': final_word,
-                            'meaning': final_meaning,
-                            'gender': final_gender,
-                            'example': "", 
-                            'last_review': None,
-                            'next_review': date.today().isoformat(),
-                            'interval': 0
-                        }
-                        st.session_state.df_all = pd.concat([st.session_state.df_all, pd.DataFrame([new_row])], ignore_index=True)
+                    if st.form_submit_button("🍽️ Ajouter", type="primary", on_click=start_interaction):
+                        final_word = with_article(final_word, final_gender)
+                        new_row = make_row(final_word, final_meaning, final_gender, final_example)
+                        add_words([new_row])
                         st.balloons()
                         st.toast(f"Bon appétit! {final_word} added.", icon="🍷")
-                        if "github" in st.secrets: sync_to_github() 
-                        st.cache_data.clear()
+                        # 翻译/词性缓存只跟单词本身有关，和词表无关，加词不需要清缓存
             else:
                 st.success("✅ Already in menu!")
+        elif is_new and 'translation' in down:
+            st.warning("🌩️ Translation is offline right now and this word isn't cached yet. Try again in a minute.")
         else:
              st.error("Not found / Pas trouvé")
+        finish_card(start)
+        timing_caption()
+    
+    st.markdown("<h1 style='text-align:center;'>Le Dictionnaire</h1>", unsafe_allow_html=True)
+    
+    search_query = st.text_input("", placeholder="", label_visibility="collapsed").strip()
+
+    if search_query:
+        # === 逻辑：只有当输入改变时，才自动播放 ===
+        # 使用 Session State 记录上一次播放的词
+        if 'last_dict_play' not in st.session_state:
+            st.session_state.last_dict_play = ""
+            
+        if st.session_state.last_dict_play != search_query:
+            play_audio_hidden(search_query)
+            st.session_state.last_dict_play = search_query
+
+        with profiler.span("render.dictionary"):
+            dict_result(search_query)
     else:
         st.markdown("<br><br><p style='text-align:center; color:#BCAAA4; font-family:Patrick Hand;'>Bon appétit !</p>", unsafe_allow_html=True)
 
@@ -427,91 +709,108 @@ if app_mode == "🔍 Dictionnaire":
 # 7. 背单词模式
 # ==========================================
 elif app_mode == "📖 Review":
-    
-    if 'study_queue' not in st.session_state:
-        today_str = date.today().isoformat()
-        mask = (st.session_state.df_all['next_review'] <= today_str) | (st.session_state.df_all['next_review'].isna())
-        due_df = st.session_state.df_all[mask]
-        
-        if len(due_df) > 50:
-            study_df = due_df.sample(50)
-        else:
-            study_df = due_df
-            
-        st.session_state.study_queue = study_df.index.tolist()
-        random.shuffle(st.session_state.study_queue)
-        st.session_state.show_back = False
 
-    if not st.session_state.study_queue:
-        st.markdown("""
-        <div style="text-align:center; padding: 50px;">
-            <div style="font-size: 60px;">🍷</div>
-            <h1 style="color:#C65D3B;">C'est fini!</h1>
-            <p style="font-family:'Patrick Hand'; font-size:20px; color:#5D4037;">No more dishes for today.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        cur_idx = st.session_state.study_queue[0]
-        if cur_idx not in st.session_state.df_all.index:
-            st.session_state.study_queue.pop(0)
-            st.rerun()
-            
-        current_word_data = st.session_state.df_all.loc[cur_idx]
-        current_word_text = current_word_data['word']
-        
-        # 🔢 进度
-        queue_len = len(st.session_state.study_queue)
-        st.markdown(f"<div class='progress-text'>Part {50 - queue_len + 1} / 50</div>", unsafe_allow_html=True)
-        
-        # === 逻辑：自动播放只在“换词”时触发 ===
-        if 'last_review_word' not in st.session_state:
-            st.session_state.last_review_word = ""
-            
-        # 如果当前词和上一次记录的词不一样，说明换词了 -> 自动播放
-        if st.session_state.last_review_word != current_word_text:
-            play_audio_hidden(current_word_text)
-            st.session_state.last_review_word = current_word_text
-
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col2:
-            # 🌟 修改点：点击按钮时，强制调用播放
-            if st.button("🔊 Pronunciation", key="review_audio", use_container_width=True):
-                play_audio_hidden(current_word_text)
+    def flip_card():
+        start_interaction()
+        st.session_state.show_back = True
+
+    def grade_card(row_id, quality):
+        # 按钮回调：先打分、出队，再由 fragment 重画下一张卡
+        start_interaction()
+        grade_word(row_id, quality)
+        st.session_state.study_queue.popleft()
+        st.session_state.show_back = False
 
-        if not st.session_state.show_back:
-            st.markdown(f"""
-            <div class="menu-card">
-                <div style="color:#BCAAA4; font-family:'Patrick Hand'; margin-bottom:10px;">Plat du Jour</div>
-                <div class="french-word">{current_word_data['word']}</div>
-                <div style="margin-top:30px; color:#D7CCC8;">( ... )</div>
+    @st.fragment
+    def review_card():
+        # 翻卡、打分只重跑这个函数：不重新设置页面、不重画 CSS 和侧边栏
+        start = begin_card()
+        queue = st.session_state.study_queue
+        while queue and queue[0] not in vocab:
+            queue.popleft()  # 别的会话改过表
+
+        if not queue:
+            if not st.session_state.get('review_synced'):
+                # 一轮复习结束：历史记录落盘，不等防抖直接推
+                history.flush()
+                if sync is not None: sync.flush_soon(vocab.snapshot)
+                st.session_state.review_synced = True
+            st.markdown("""
+            <div style="text-align:center; padding: 50px;">
+                <div style="font-size: 60px;">🍷</div>
+                <h1 style="color:#C65D3B;">C'est fini!</h1>
+                <p style="font-family:'Patrick Hand'; font-size:20px; color:#5D4037;">No more dishes for today.</p>
             </div>
             """, unsafe_allow_html=True)
-            
-            if st.button("🔍 Voir", use_container_width=True):
-                st.session_state.show_back = True
-                st.rerun()
         else:
-            st.markdown(f"""
-            <div class="menu-card">
-                <div class="french-word">{current_word_data['word']}</div>
-                <div class="word-meta">{current_word_data.get('gender', '')}</div>
-                <div class="menu-divider"></div>
-                <div class="word-meaning">{current_word_data['meaning']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            cur_idx = queue[0]
+
+            # 🔊 后台预渲染当前和接下来几张卡片，翻卡时直接命中缓存
+            get_audio_cache().prefetch(vocab.words(islice(queue, AUDIO_PREFETCH + 1)))
+                
+            current_word_data = vocab.row(cur_idx)
+            current_word_text = current_word_data['word']
             
-            c1, c2 = st.columns(2)
-            with c1:
-                if st.button("🍷 Délicieux", use_container_width=True, type="primary"):
-                    st.session_state.df_all.loc[cur_idx] = update_word_progress(current_word_data.copy(), 1)
-                    st.session_state.study_queue.pop(0)
-                    st.session_state.show_back = False
-                    st.rerun()
-            with c2:
-                if st.button("🧂 Trop Salé", use_container_width=True):
-                    st.session_state.df_all.loc[cur_idx] = update_word_progress(current_word_data.copy(), 0)
-                    st.session_state.study_queue.pop(0)
-                    st.session_state.show_back = False
-                    st.rerun()
+            # 🔢 进度
+            total = st.session_state.session_total
+            done = total - len(queue)
+            st.markdown(f"<div class='progress-text'>Part {done + 1} / {total}</div>", unsafe_allow_html=True)
+            
+            # === 逻辑：自动播放只在“换词”时触发 ===
+            if 'last_review_word' not in st.session_state:
+                st.session_state.last_review_word = ""
+                
+            # 如果当前词和上一次记录的词不一样，说明换词了 -> 自动播放
+            if st.session_state.last_review_word != current_word_text:
+                play_audio_hidden(current_word_text)
+                st.session_state.last_review_word = current_word_text
+
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col2:
+                # 🌟 修改点：点击按钮时，强制调用播放
+                if st.button("🔊 Pronunciation", key="review_audio", use_container_width=True, on_click=start_interaction):
+                    play_audio_hidden(current_word_text)
+
+            if not st.session_state.show_back:
+                st.markdown(f"""
+                <div class="menu-card">
+                    <div style="color:#BCAAA4; font-family:'Patrick Hand'; margin-bottom:10px;">Plat du Jour</div>
+                    <div class="french-word">{current_word_data['word']}</div>
+                    <div style="margin-top:30px; color:#D7CCC8;">( ... )</div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                st.button("🔍 Voir", use_container_width=True, on_click=flip_card)
+            else:
+                st.markdown(f"""
+                <div class="menu-card">
+                    <div class="french-word">{current_word_data['word']}</div>
+                    <div class="word-meta">{current_word_data.get('gender', '')}</div>
+                    <div class="menu-divider"></div>
+                    <div class="word-meaning">{current_word_data['meaning']}</div>{example_html(current_word_data.get('example'))}
+                </div>
+                """, unsafe_allow_html=True)
+                
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.button("🍷 Délicieux", use_container_width=True, type="primary", on_click=grade_card, args=(cur_idx, 1))
+                with c2:
+                    st.button("🧂 Trop Salé", use_container_width=True, on_click=grade_card, args=(cur_idx, 0))
+        finish_card(start)
+        timing_caption()
+
+    if 'study_queue' not in st.session_state:
+        # 调度器堆顶取最早到期的卡，O(k log n)，不扫整张表
+        st.session_state.study_queue = deque(vocab.session(date.today().isoformat(), REVIEW_SESSION_SIZE, REVIEW_NEW_LIMIT))
+        st.session_state.session_total = len(st.session_state.study_queue)
+        st.session_state.show_back = False
+        st.session_state.review_synced = False
+
+    with profiler.span("render.review"):
+        review_card()
 
 st.markdown("<br><div style='text-align:center; color:#D7CCC8; font-family:Patrick Hand;'>Fait avec amour par Python</div>", unsafe_allow_html=True)
+
+finish_interaction("page", PAGE_START)
+profiler.end_run()
+st.session_state.full_rerun = False